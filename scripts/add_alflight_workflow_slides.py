@@ -4,191 +4,23 @@ Script pour ajouter les slides expliquant le workflow ALFlight
 - Utilisations suivantes : 3 minutes (préparation vol)
 """
 
-import subprocess
-import sys
+from functools import partial
 
-# Installer python-pptx si nécessaire
-try:
-    from pptx import Presentation
-    from pptx.util import Inches, Pt
-    from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-    from pptx.dml.color import RGBColor
-except ImportError:
-    print("Installation de python-pptx...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "python-pptx"])
-    from pptx import Presentation
-    from pptx.util import Inches, Pt
-    from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-    from pptx.dml.color import RGBColor
+import alflight_slides  # installe python-pptx si nécessaire
+from pptx.dml.color import RGBColor
+from pptx_zip import DeckAppender
 
-def add_title_content_slide(prs, title_text, content_lines, subtitle=None, slide_index=None):
-    """Ajoute une slide avec titre et contenu bullet points"""
-    slide_layout = prs.slide_layouts[1]  # Layout avec titre et contenu
+# Slides de contenu : succès en vert, rapidité en bleu (constructeurs communs : alflight_slides.py)
+add_title_content_slide = partial(alflight_slides.add_title_content_slide, sizes=(18, 15, 13),
+                                  spacing=(10, 6, 3), highlights=alflight_slides.SUCCESS)
+add_transition_slide = alflight_slides.add_transition_slide
+add_two_columns_slide = alflight_slides.add_two_columns_slide
 
-    if slide_index is not None:
-        # Insérer à une position spécifique
-        slide = prs.slides.add_slide(slide_layout)
-        # Move to correct position
-        xml_slides = prs.slides._sldIdLst
-        slides = list(xml_slides)
-        xml_slides.remove(slides[-1])
-        xml_slides.insert(slide_index, slides[-1])
-    else:
-        slide = prs.slides.add_slide(slide_layout)
+# Ouvrir la présentation existante (ajout au niveau du zip : seules les nouvelles slides sont écrites)
+deck = DeckAppender('ALFlight_Presentation.pptx')
+prs = deck.presentation
 
-    # Titre
-    title = slide.shapes.title
-    title.text = title_text
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.bold = True
-    title.text_frame.paragraphs[0].font.color.rgb = RGBColor(147, 22, 60)  # Bordeaux ALFlight
-
-    # Contenu
-    body = slide.placeholders[1]
-    tf = body.text_frame
-    tf.clear()
-
-    # Sous-titre optionnel
-    if subtitle:
-        p = tf.paragraphs[0]
-        p.text = subtitle
-        p.font.size = Pt(18)
-        p.font.italic = True
-        p.font.color.rgb = RGBColor(107, 15, 43)
-        p.space_after = Pt(20)
-
-    # Lignes de contenu
-    for i, line in enumerate(content_lines):
-        if i == 0 and not subtitle:
-            p = tf.paragraphs[0]
-        else:
-            p = tf.add_paragraph()
-
-        # Déterminer le niveau d'indentation
-        if line.startswith("    "):
-            p.text = line.strip()
-            p.level = 2
-        elif line.startswith("  "):
-            p.text = line.strip()
-            p.level = 1
-        else:
-            p.text = line
-            p.level = 0
-
-        # Tailles de police selon niveau
-        if p.level == 0:
-            p.font.size = Pt(18)
-        elif p.level == 1:
-            p.font.size = Pt(15)
-        else:
-            p.font.size = Pt(13)
-
-        p.space_before = Pt(10) if p.level == 0 else Pt(6) if p.level == 1 else Pt(3)
-
-        # Couleurs spéciales
-        if "✅" in line or "SUCCESS" in line:
-            p.font.color.rgb = RGBColor(16, 185, 129)  # Vert
-            p.font.bold = True
-        elif "⚡" in line or "RAPIDE" in line:
-            p.font.color.rgb = RGBColor(59, 130, 246)  # Bleu
-            p.font.bold = True
-
-    return slide
-
-def add_transition_slide(prs, title_text, subtitle_text=None, bg_color=None):
-    """Ajoute une slide de transition"""
-    slide_layout = prs.slide_layouts[5]  # Layout vide
-    slide = prs.slides.add_slide(slide_layout)
-
-    # Fond (bordeaux par défaut)
-    if bg_color is None:
-        bg_color = RGBColor(139, 21, 56)
-
-    background = slide.background
-    fill = background.fill
-    fill.solid()
-    fill.fore_color.rgb = bg_color
-
-    # Titre centré en blanc
-    left = Inches(1)
-    top = Inches(2.5)
-    width = Inches(8)
-    height = Inches(2)
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-
-    p = tf.paragraphs[0]
-    p.text = title_text
-    p.font.size = Pt(60)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(255, 255, 255)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Sous-titre
-    if subtitle_text:
-        p2 = tf.add_paragraph()
-        p2.text = subtitle_text
-        p2.font.size = Pt(32)
-        p2.font.color.rgb = RGBColor(255, 255, 255)
-        p2.alignment = PP_ALIGN.CENTER
-        p2.space_before = Pt(20)
-
-    return slide
-
-def add_two_columns_slide(prs, title_text, left_title, left_content, right_title, right_content):
-    """Ajoute une slide avec 2 colonnes de comparaison"""
-    slide_layout = prs.slide_layouts[3]  # Layout deux colonnes
-    slide = prs.slides.add_slide(slide_layout)
-
-    # Titre principal
-    title = slide.shapes.title
-    title.text = title_text
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.bold = True
-    title.text_frame.paragraphs[0].font.color.rgb = RGBColor(147, 22, 60)
-
-    # Colonne gauche
-    left_shape = slide.placeholders[1]
-    left_tf = left_shape.text_frame
-    left_tf.clear()
-
-    p_left_title = left_tf.paragraphs[0]
-    p_left_title.text = left_title
-    p_left_title.font.size = Pt(24)
-    p_left_title.font.bold = True
-    p_left_title.font.color.rgb = RGBColor(59, 130, 246)  # Bleu
-    p_left_title.space_after = Pt(15)
-
-    for line in left_content:
-        p = left_tf.add_paragraph()
-        p.text = line
-        p.font.size = Pt(14)
-        p.space_before = Pt(6)
-
-    # Colonne droite
-    right_shape = slide.placeholders[2]
-    right_tf = right_shape.text_frame
-    right_tf.clear()
-
-    p_right_title = right_tf.paragraphs[0]
-    p_right_title.text = right_title
-    p_right_title.font.size = Pt(24)
-    p_right_title.font.bold = True
-    p_right_title.font.color.rgb = RGBColor(16, 185, 129)  # Vert
-    p_right_title.space_after = Pt(15)
-
-    for line in right_content:
-        p = right_tf.add_paragraph()
-        p.text = line
-        p.font.size = Pt(14)
-        p.space_before = Pt(6)
-
-    return slide
-
-# Ouvrir la présentation existante
-prs = Presentation('ALFlight_Presentation.pptx')
-
-print(f"Presentation chargee. Nombre de slides actuelles: {len(prs.slides)}")
+print(f"Presentation chargee. Nombre de slides actuelles: {deck.slide_count}")
 
 # ============================================
 # SLIDE 9: Titre section "Avec ALFlight"
@@ -411,11 +243,11 @@ slide16 = add_transition_slide(
     bg_color=RGBColor(147, 22, 60)  # Retour bordeaux ALFlight
 )
 
-print(f"\nSlides ajoutees avec succes ! Total slides : {len(prs.slides)}")
+print(f"\nSlides ajoutees avec succes ! Total slides : {deck.slide_count}")
 
 # Sauvegarder la présentation avec nouveau nom
 output_path = 'ALFlight_Presentation_Complete.pptx'
-prs.save(output_path)
+deck.save(output_path)
 print(f"Presentation mise a jour : {output_path}")
 print("\nContenu ajoute :")
 print("  - Slide 9 : Titre section 'Avec ALFlight'")
@@ -3,109 +3,27 @@ Script pour ajouter des slides sur la préparation de vol manuelle (sans ALFligh
 Crée un contraste brutal entre la méthode traditionnelle et l'app
 """
 
-import subprocess
-import sys
+from functools import partial
 
-# Installer python-pptx si nécessaire
-try:
-    from pptx import Presentation
-    from pptx.util import Inches, Pt
-    from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-    from pptx.dml.color import RGBColor
-except ImportError:
-    print("Installation de python-pptx...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "python-pptx"])
-    from pptx import Presentation
-    from pptx.util import Inches, Pt
-    from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-    from pptx.dml.color import RGBColor
+import alflight_slides  # installe python-pptx si nécessaire
+from pptx_zip import DeckAppender
 
-def add_title_content_slide(prs, title_text, content_lines, subtitle=None):
-    """Ajoute une slide avec titre et contenu bullet points"""
-    slide_layout = prs.slide_layouts[1]  # Layout avec titre et contenu
-    slide = prs.slides.add_slide(slide_layout)
 
-    # Titre
-    title = slide.shapes.title
-    title.text = title_text
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.bold = True
-    title.text_frame.paragraphs[0].font.color.rgb = RGBColor(147, 22, 60)  # Bordeaux ALFlight
+def _level(line):
+    """Deux niveaux seulement, texte gardé tel qu'écrit : toute ligne indentée est au niveau 1"""
+    return (1 if line.startswith("  ") else 0), line
 
-    # Contenu
-    body = slide.placeholders[1]
-    tf = body.text_frame
-    tf.clear()
 
-    # Sous-titre optionnel
-    if subtitle:
-        p = tf.paragraphs[0]
-        p.text = subtitle
-        p.font.size = Pt(18)
-        p.font.italic = True
-        p.font.color.rgb = RGBColor(107, 15, 43)
-        p.space_after = Pt(20)
+# Slides de contenu : warnings en rouge (constructeurs communs : alflight_slides.py)
+add_title_content_slide = partial(alflight_slides.add_title_content_slide, sizes=(16, 14),
+                                  highlights=alflight_slides.WARNINGS, level=_level)
+add_transition_slide = alflight_slides.add_transition_slide
 
-    # Lignes de contenu
-    for i, line in enumerate(content_lines):
-        if i == 0 and not subtitle:
-            p = tf.paragraphs[0]
-        else:
-            p = tf.add_paragraph()
+# Ouvrir la présentation existante (ajout au niveau du zip : seules les nouvelles slides sont écrites)
+deck = DeckAppender('ALFlight_Presentation.pptx')
+prs = deck.presentation
 
-        p.text = line
-        p.level = 0 if not line.startswith("  ") else 1
-        p.font.size = Pt(16) if p.level == 0 else Pt(14)
-        p.space_before = Pt(8) if p.level == 0 else Pt(4)
-
-        # Couleur rouge pour les warnings
-        if "⚠️" in line or "❌" in line or "ATTENTION" in line:
-            p.font.color.rgb = RGBColor(239, 68, 68)
-            p.font.bold = True
-
-    return slide
-
-def add_transition_slide(prs, title_text, subtitle_text):
-    """Ajoute une slide de transition dramatique"""
-    slide_layout = prs.slide_layouts[5]  # Layout vide
-    slide = prs.slides.add_slide(slide_layout)
-
-    # Fond bordeaux
-    background = slide.background
-    fill = background.fill
-    fill.solid()
-    fill.fore_color.rgb = RGBColor(139, 21, 56)
-
-    # Titre centré en blanc
-    left = Inches(1)
-    top = Inches(2.5)
-    width = Inches(8)
-    height = Inches(2)
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-
-    p = tf.paragraphs[0]
-    p.text = title_text
-    p.font.size = Pt(60)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(255, 255, 255)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Sous-titre
-    if subtitle_text:
-        p2 = tf.add_paragraph()
-        p2.text = subtitle_text
-        p2.font.size = Pt(32)
-        p2.font.color.rgb = RGBColor(255, 255, 255)
-        p2.alignment = PP_ALIGN.CENTER
-        p2.space_before = Pt(20)
-
-    return slide
-
-# Ouvrir la présentation existante
-prs = Presentation('ALFlight_Presentation.pptx')
-
-print(f"Présentation chargée. Nombre de slides actuelles: {len(prs.slides)}")
+print(f"Présentation chargée. Nombre de slides actuelles: {deck.slide_count}")
 
 # ============================================
 # SLIDE 1: Titre choc
@@ -346,11 +264,11 @@ slide8 = add_transition_slide(
     "Tout cela pouvait prendre 15 minutes ?"
 )
 
-print(f"\nSlides ajoutées avec succès ! Total slides : {len(prs.slides)}")
+print(f"\nSlides ajoutées avec succès ! Total slides : {deck.slide_count}")
 
 # Sauvegarder la présentation
 output_path = 'ALFlight_Presentation_Updated.pptx'
-prs.save(output_path)
+deck.save(output_path)
 print(f"✅ Présentation sauvegardée : {output_path}")
 print("\nContenu ajouté :")
 print("  - Slide 1 : Titre choc")
@@ -0,0 +1,175 @@
+"""
+Constructeurs de slides communs aux scripts de la présentation ALFlight
+(add_manual_prep_slides.py, add_alflight_workflow_slides.py, md_to_slides.py)
+
+- Les valeurs par défaut donnent le style de la présentation (titres 40 pt,
+  transitions 60/32 pt sur fond bordeaux)
+- Les variations propres à chaque script (tailles, couleurs de mise en
+  évidence) sont passées en paramètres, jamais recopiées
+- Lignes de contenu : "  " = niveau 1, "    " = niveau 2 (par défaut, voir _level)
+"""
+
+import subprocess
+import sys
+
+# Installer python-pptx si nécessaire
+try:
+    from pptx.util import Inches, Pt
+    from pptx.enum.text import PP_ALIGN
+    from pptx.dml.color import RGBColor
+except ImportError:
+    print("Installation de python-pptx...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "python-pptx"])
+    from pptx.util import Inches, Pt
+    from pptx.enum.text import PP_ALIGN
+    from pptx.dml.color import RGBColor
+
+BORDEAUX = RGBColor(139, 21, 56)
+TITLE_COLOR = RGBColor(147, 22, 60)  # Bordeaux ALFlight
+SUBTITLE_COLOR = RGBColor(107, 15, 43)
+WHITE = RGBColor(255, 255, 255)
+RED = RGBColor(239, 68, 68)
+GREEN = RGBColor(16, 185, 129)
+BLUE = RGBColor(59, 130, 246)
+
+# (marqueurs, couleur, gras) : une ligne contenant un marqueur prend la couleur
+WARNINGS = ((("⚠️", "❌", "ATTENTION"), RED, True),)
+CRITICAL = ((("🔴", "CRITIQUE"), RED, False),)
+SUCCESS = (
+    (("✅", "SUCCESS"), GREEN, True),
+    (("⚡", "RAPIDE"), BLUE, True),
+)
+
+
+def _level(line):
+    """(niveau, texte) d'une ligne de contenu indentée, indentation retirée"""
+    if line.startswith("    "):
+        return 2, line.strip()
+    if line.startswith("  "):
+        return 1, line.strip()
+    return 0, line
+
+
+def add_title_content_slide(prs, title_text, content_lines, subtitle=None, title_size=40,
+                            sizes=(16, 14, 12), spacing=(8, 4, 4), highlights=(), level=_level):
+    """Ajoute une slide avec titre et contenu bullet points
+
+    sizes / spacing : taille de police et espace avant, par niveau (0, 1, 2)
+    highlights : règles de mise en évidence, voir WARNINGS / CRITICAL / SUCCESS
+    level : ligne -> (niveau, texte affiché)
+    """
+    slide_layout = prs.slide_layouts[1]  # Layout avec titre et contenu
+    slide = prs.slides.add_slide(slide_layout)
+
+    # Titre
+    title = slide.shapes.title
+    title.text = title_text
+    title.text_frame.paragraphs[0].font.size = Pt(title_size)
+    title.text_frame.paragraphs[0].font.bold = True
+    title.text_frame.paragraphs[0].font.color.rgb = TITLE_COLOR
+
+    # Contenu
+    body = slide.placeholders[1]
+    tf = body.text_frame
+    tf.clear()
+
+    # Sous-titre optionnel
+    if subtitle:
+        p = tf.paragraphs[0]
+        p.text = subtitle
+        p.font.size = Pt(18)
+        p.font.italic = True
+        p.font.color.rgb = SUBTITLE_COLOR
+        p.space_after = Pt(20)
+
+    # Lignes de contenu
+    for i, line in enumerate(content_lines):
+        if i == 0 and not subtitle:
+            p = tf.paragraphs[0]
+        else:
+            p = tf.add_paragraph()
+
+        p.level, p.text = level(line)
+        p.font.size = Pt(sizes[p.level])
+        p.space_before = Pt(spacing[p.level])
+
+        for markers, color, bold in highlights:
+            if any(marker in line for marker in markers):
+                p.font.color.rgb = color
+                if bold:
+                    p.font.bold = True
+                break
+
+    return slide
+
+
+def add_transition_slide(prs, title_text, subtitle_text=None, bg_color=None,
+                         title_size=60, subtitle_size=32, word_wrap=None):
+    """Ajoute une slide de transition (fond bordeaux par défaut)"""
+    slide_layout = prs.slide_layouts[5]  # Layout vide
+    slide = prs.slides.add_slide(slide_layout)
+
+    background = slide.background
+    fill = background.fill
+    fill.solid()
+    fill.fore_color.rgb = bg_color if bg_color is not None else BORDEAUX
+
+    # Titre centré en blanc
+    txBox = slide.shapes.add_textbox(Inches(1), Inches(2.5), Inches(8), Inches(2))
+    tf = txBox.text_frame
+    if word_wrap is not None:
+        tf.word_wrap = word_wrap
+
+    p = tf.paragraphs[0]
+    p.text = title_text
+    p.font.size = Pt(title_size)
+    p.font.bold = True
+    p.font.color.rgb = WHITE
+    p.alignment = PP_ALIGN.CENTER
+
+    # Sous-titre
+    if subtitle_text:
+        p2 = tf.add_paragraph()
+        p2.text = subtitle_text
+        p2.font.size = Pt(subtitle_size)
+        p2.font.color.rgb = WHITE
+        p2.alignment = PP_ALIGN.CENTER
+        p2.space_before = Pt(20)
+
+    return slide
+
+
+def add_two_columns_slide(prs, title_text, left_title, left_content, right_title, right_content):
+    """Ajoute une slide avec 2 colonnes de comparaison"""
+    slide_layout = prs.slide_layouts[3]  # Layout deux colonnes
+    slide = prs.slides.add_slide(slide_layout)
+
+    # Titre principal
+    title = slide.shapes.title
+    title.text = title_text
+    title.text_frame.paragraphs[0].font.size = Pt(40)
+    title.text_frame.paragraphs[0].font.bold = True
+    title.text_frame.paragraphs[0].font.color.rgb = TITLE_COLOR
+
+    columns = (
+        (slide.placeholders[1], left_title, left_content, BLUE),
+        (slide.placeholders[2], right_title, right_content, GREEN),
+    )
+    for shape, column_title, content, color in columns:
+        tf = shape.text_frame
+        tf.clear()
+
+        p_title = tf.paragraphs[0]
+        p_title.text = column_title
+        p_title.font.size = Pt(24)
+        p_title.font.bold = True
+        p_title.font.color.rgb = color
+        p_title.space_after = Pt(15)
+
+        for line in content:
+            p = tf.add_paragraph()
+            p.text = line
+            p.font.size = Pt(14)
+            p.space_before = Pt(6)
+
+    return slide
@@ -0,0 +1,9 @@
+"""Structural balance checker for the ALFlight sources (braces, strings, JSX tags)."""
+
+from .languages import Language, for_path, get_language, register
+from .scanner import Issue, ScanResult, line_at, line_col, line_starts, line_text, nest, scan_file, scan_text
+
+__all__ = [
+    'Issue', 'Language', 'ScanResult', 'for_path', 'get_language', 'line_at', 'line_col',
+    'line_starts', 'line_text', 'nest', 'register', 'scan_file', 'scan_text',
+]
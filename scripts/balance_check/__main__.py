@@ -0,0 +1,323 @@
+"""
+Usage (from the repo root):
+    python -m scripts.balance_check check                  # whole repo, every registered language
+    python -m scripts.balance_check check src/features/flight-wizard/steps
+    python -m scripts.balance_check check --lang javascript src/utils/foo.js
+    python -m scripts.balance_check check --suggest --patch fixes.patch src   # then: git apply fixes.patch
+    python -m scripts.balance_check report src --json metrics.json
+    python -m scripts.balance_check bisect src/pages/AbacDemo.tsx
+    python -m scripts.balance_check codemod rules.json src            # dry run: prints the diff
+    python -m scripts.balance_check codemod rules.json src --apply
+    python -m scripts.balance_check structdiff src/pages/AbacDemo.tsx          # HEAD vs working tree
+    python -m scripts.balance_check structdiff src/pages/AbacDemo.tsx --old HEAD~3 --new HEAD
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from . import languages
+from .codemod import load_rules, run_codemod
+from .history import BlobReader, bisect_file, git, repo_path
+from .metrics import largest_blocks, measure
+from .repair import repair_patch, suggest_repair
+from .scanner import scan_file
+from .structdiff import build_tree, diff_trees
+
+CODE_LANGUAGES = ('javascript', 'jsx', 'typescript', 'tsx')
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', 'coverage', '.vercel'}
+
+
+def iter_files(paths, extensions):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.join(root, name)
+
+
+def cmd_check(args):
+    start = time.perf_counter()
+    checked = failed = 0
+    patches = []
+    forced = languages.get_language(args.lang) if args.lang else None
+    for path in iter_files(args.paths, languages.extensions()):
+        if forced is None and languages.for_path(path) is None:
+            print(f"{path}: skipped, no language registered for this file type", file=sys.stderr)
+            continue
+        result = scan_file(path, forced)
+        checked += 1
+        if not result.ok:
+            failed += 1
+            for issue in result.issues:
+                print(f"{path}: {issue}")
+            if args.suggest:
+                patch = _suggest(path, forced, args)
+                if patch:
+                    patches.append(patch)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{checked} file(s) checked, {failed} with errors ({elapsed:.0f} ms)")
+    if args.patch and patches:
+        with open(args.patch, 'w', encoding='utf-8', newline='\n') as f:
+            f.writelines(patches)
+        print(f"{len(patches)} repair(s) written to {args.patch}")
+    return 1 if failed else 0
+
+
+def _suggest(path, language, args):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    repair = suggest_repair(text, language or languages.for_path(path),
+                            max_nodes=args.max_nodes, budget_ms=args.budget_ms)
+    if not repair.found:
+        print(f"  no repair found ({repair.nodes} node(s), {repair.elapsed_ms:.0f} ms)")
+        return None
+    patch = repair_patch(path, text, repair)
+    print(f"  suggested repair: {len(repair.edits)} edit(s) "
+          f"({repair.nodes} node(s), {repair.elapsed_ms:.0f} ms)")
+    if not args.patch:
+        print(patch, end='')
+    return patch
+
+
+def cmd_report(args):
+    start = time.perf_counter()
+    results = []
+    for path in iter_files(args.paths, languages.extensions()):
+        language = languages.for_path(path)
+        if language is None or language.name not in (args.lang_filter or CODE_LANGUAGES):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        results.append(measure(text, language, os.path.normpath(path).replace(os.sep, '/'))[1])
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{'lines':>6}  {'span':<13}  block")
+    for metrics, block in largest_blocks(results, args.top):
+        span = f"{block.start_line}-{block.end_line}"
+        print(f"{block.lines:>6}  {span:<13}  {metrics.path}: {block.label}")
+        for child in block.children:
+            print(f"{'':>6}  {'':<13}    {child.lines:>5} lines @{child.start_line}: {child.label}")
+
+    deepest = sorted(results, key=lambda m: -m.max_depth)[:5]
+    print("\nDeepest nesting: " + ", ".join(f"{m.path}:{m.max_depth_line} ({m.max_depth})" for m in deepest))
+    print(f"{len(results)} file(s), {sum(m.components for m in results)} component(s), "
+          f"{sum(m.functions for m in results)} function(s) ({elapsed:.0f} ms)")
+
+    if args.json:
+        try:
+            commit = git('rev-parse', 'HEAD').strip()
+        except (subprocess.CalledProcessError, OSError):
+            commit = None
+        payload = {
+            'commit': commit,
+            'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'largest_blocks': [dict(path=m.path, start_line=b.start_line, end_line=b.end_line,
+                                    lines=b.lines, label=b.label)
+                               for m, b in largest_blocks(results, args.top)],
+            'files': [m.to_dict() for m in sorted(results, key=lambda m: -m.lines)],
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        print(f"Report written to {args.json}")
+    return 0
+
+
+def _fail(command, exc):
+    """Print an expected failure (bad path, unknown revision, git error) on one line."""
+    message = str(exc)
+    if isinstance(exc, subprocess.CalledProcessError) and exc.stderr:
+        lines = exc.stderr.decode('utf-8', errors='replace').strip().splitlines()
+        message = lines[0] if lines else message
+    print(f"{command}: {message}", file=sys.stderr)
+    return 2
+
+
+def _oneline(root, rev):
+    return git('log', '-1', '--format=%h %ad %s', '--date=short', rev, cwd=root).strip()
+
+
+def cmd_bisect(args):
+    start = time.perf_counter()
+    try:
+        result = bisect_file(args.path, rev=args.rev, good=args.good)
+    except (ValueError, subprocess.CalledProcessError, OSError) as exc:
+        return _fail('bisect', exc)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.first_bad is None:
+        print(f"{result.path}: balanced at {args.rev} ({result.commits} commit(s) touch it)")
+        return 0
+    print(f"{result.path}: first bad commit {_oneline(result.root, result.first_bad)}")
+    if result.last_good:
+        print(f"  last good: {_oneline(result.root, result.last_good)}")
+    else:
+        print("  already unbalanced when the file was introduced")
+    for issue in result.issues:
+        print(f"  {issue}")
+    print(f"{result.checks} check(s) over {result.commits} commit(s) ({elapsed:.0f} ms)")
+    return 1
+
+
+def cmd_codemod(args):
+    start = time.perf_counter()
+    rules = load_rules(args.rules)
+    paths = []
+    for path in iter_files(args.paths, languages.extensions()):
+        language = languages.for_path(path)
+        if language is not None and language.name in CODE_LANGUAGES:
+            paths.append(path)
+        elif os.path.isfile(path) and path in args.paths:
+            print(f"{path}: skipped, not a JS/TS source", file=sys.stderr)
+    totals = [0] * len(rules)
+    changed = []
+    refused = 0
+    for edit in run_codemod(rules, paths, apply=args.apply, jobs=args.jobs):
+        for index, count in edit.counts.items():
+            if edit.status == 'changed':
+                totals[index] += count
+        if edit.status == 'changed':
+            changed.append(edit)
+            if not args.apply:
+                print(edit.diff, end='')
+        elif edit.status in ('skipped', 'rejected'):
+            refused += 1
+            print(f"{edit.path}: {edit.status}, {edit.message}", file=sys.stderr)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    out = sys.stdout if args.apply else sys.stderr
+    for rule, total in zip(rules, totals):
+        print(f"{total:>6}  [{rule.scope}] {rule.find!r} -> {rule.replace!r}", file=out)
+    verb = 'changed' if args.apply else 'would change'
+    print(f"{len(paths)} file(s) scanned, {len(changed)} {verb}, {refused} left untouched "
+          f"({elapsed:.0f} ms)", file=out)
+    return 1 if refused else 0
+
+
+def _read_version(path, rev):
+    """Text of `path` at `rev` (None: the working tree), or None when the file is not there."""
+    if rev is None:
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+    root, rel = repo_path(path)
+    try:
+        git('rev-parse', '--verify', '--quiet', f'{rev}^{{commit}}', cwd=root)
+    except subprocess.CalledProcessError:
+        raise ValueError(f"unknown revision {rev}") from None
+    with BlobReader(root) as reader:
+        _, data = reader.read(rev, rel)
+    return None if data is None else data.decode('utf-8', errors='replace')
+
+
+def _span(node):
+    return f"L{node.start_line}-{node.end_line}"
+
+
+def cmd_structdiff(args):
+    start = time.perf_counter()
+    names = [args.old, args.new or 'working tree']
+    try:
+        language = languages.get_language(args.lang) if args.lang else languages.for_path(args.path)
+        if language is None:
+            raise ValueError(f"No language registered for {args.path}")
+        texts = [_read_version(args.path, rev) for rev in (args.old, args.new)]
+    except (ValueError, subprocess.CalledProcessError, OSError) as exc:
+        return _fail('structdiff', exc)
+    if texts == [None, None]:
+        return _fail('structdiff', f"{args.path} is missing from both {names[0]} and {names[1]}")
+    trees = []
+    for name, text in zip(names, texts):
+        # A side without the file is an empty tree: everything shows as added (or removed)
+        tree, issues = build_tree(text or '', language)
+        if issues:
+            print(f"{args.path} at {name} is unbalanced: {issues[0]}")
+            return 2
+        trees.append(tree)
+    result = diff_trees(*trees)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for i, text in enumerate(texts):
+        if text is None:
+            names[i] += ' (no such file)'
+    print(f"{args.path}: {names[0]} -> {names[1]}")
+    for change in result.changes:
+        old, new = change.old, change.new
+        if change.kind == 'removed':
+            print(f"  removed  {_span(old):<19} {old.lines:>5} lines  {old.label}")
+        elif change.kind == 'added':
+            print(f"  added    {_span(new):<19} {new.lines:>5} lines  {new.label}")
+        elif change.kind == 'moved':
+            print(f"  moved    {_span(old) + ' -> ' + _span(new):<19} {old.lines:>5} lines  {old.label}")
+        else:
+            print(f"  changed  {_span(old) + ' -> ' + _span(new):<19} "
+                  f"-{len(change.removed_lines)} +{len(change.added_lines)} line(s) outside blocks  "
+                  f"{old.label or '(file)'}")
+            for line, text in change.removed_lines[:args.context]:
+                print(f"{'':>11}- L{line}: {text}")
+            for line, text in change.added_lines[:args.context]:
+                print(f"{'':>11}+ L{line}: {text}")
+    print(f"{result.count('removed')} removed, {result.count('added')} added, {result.count('moved')} moved, "
+          f"{result.count('changed')} changed; {result.unchanged} block(s) unchanged ({elapsed:.0f} ms)")
+    return 0 if result.identical else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='balance_check', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    check = sub.add_parser('check', help='check delimiter and JSX tag balance')
+    check.add_argument('paths', nargs='*', default=['.'], help='files or directories (default: repo)')
+    check.add_argument('--lang', choices=sorted(languages.REGISTRY),
+                       help='force a language instead of picking it from the extension')
+    check.add_argument('--suggest', action='store_true', help='propose a minimal repair for each failure')
+    check.add_argument('--patch', help='write suggested repairs to this file instead of printing them')
+    check.add_argument('--max-nodes', type=int, default=200, help='repair search node budget')
+    check.add_argument('--budget-ms', type=int, default=500, help='repair search time budget per file')
+    check.set_defaults(func=cmd_check)
+
+    report = sub.add_parser('report', help='structural complexity metrics, largest blocks first')
+    report.add_argument('paths', nargs='*', default=['.'], help='files or directories (default: repo)')
+    report.add_argument('--lang', dest='lang_filter', action='append', choices=sorted(languages.REGISTRY),
+                        help='only these languages (repeatable, default: JS/TS sources)')
+    report.add_argument('--top', type=int, default=20, help='number of blocks to list')
+    report.add_argument('--json', help='also write the full report to this JSON file')
+    report.set_defaults(func=cmd_report)
+
+    bisect = sub.add_parser('bisect', help='find the first commit where a file became unbalanced')
+    bisect.add_argument('path')
+    bisect.add_argument('--rev', default='HEAD', help='known bad revision (default: HEAD)')
+    bisect.add_argument('--good', help='known good revision (default: when the file was added)')
+    bisect.set_defaults(func=cmd_bisect)
+
+    codemod = sub.add_parser('codemod', help='apply find/replace rules outside strings and comments')
+    codemod.add_argument('rules', help='JSON rules file (see scripts/balance_check/codemod.py)')
+    codemod.add_argument('paths', nargs='*', default=['src'], help='files or directories (default: src)')
+    codemod.add_argument('--apply', action='store_true', help='write the changes (default: print the diff)')
+    codemod.add_argument('--jobs', type=int, help='worker processes (default: CPU count)')
+    codemod.set_defaults(func=cmd_codemod)
+
+    structdiff = sub.add_parser('structdiff', help='block-level diff of two versions of a file')
+    structdiff.add_argument('path')
+    structdiff.add_argument('--old', default='HEAD', help='old revision (default: HEAD)')
+    structdiff.add_argument('--new', help='new revision (default: the working tree file)')
+    structdiff.add_argument('--lang', choices=sorted(languages.REGISTRY),
+                            help='force a language instead of picking it from the extension')
+    structdiff.add_argument('--context', type=int, default=5,
+                            help='lines outside blocks shown per changed block')
+    structdiff.set_defaults(func=cmd_structdiff)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Multi-pattern codemod engine for the JS/JSX/TS sources.
+
+The rules of a rules file are compiled into one alternation regex per region
+kind (code, string, comment, regex literal, JSX text), so each file is read
+and matched once whatever the number of rules. The same file scan that checks
+balance also records the regions, and each rule only applies inside the scope
+it declares; when finds overlap, the longest one that fits the scope wins:
+
+    {"rules": [
+        {"find": "LBS_TO_KG", "replace": "KG_PER_LB", "word": true},
+        {"find": "'lbs'", "replace": "'lb'", "scope": "string"},
+        {"find": "Masse (kg)", "replace": "Masse", "scope": "text"}
+    ]}
+
+scope: "code" (default: outside strings, comments and regex literals),
+"string", "comment", "text" (JSX children) or "any". Files that are
+unbalanced before the edit are skipped; edits that would unbalance a file
+are rejected. Writes are atomic (temp file + os.replace).
+"""
+
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from . import languages
+from .repair import unified_patch
+from .scanner import scan_text
+
+SCOPES = ('code', 'string', 'comment', 'text', 'any')
+REGION_KINDS = ('code', 'string', 'comment', 'regex', 'text')  # regex literals: 'any' rules only
+
+
+@dataclass(frozen=True)
+class Rule:
+    find: str
+    replace: str
+    scope: str = 'code'
+    word: bool = False
+
+
+@dataclass
+class FileEdit:
+    path: str
+    status: str  # 'unchanged' | 'changed' | 'skipped' | 'rejected'
+    counts: dict = field(default_factory=dict)
+    diff: str = ''
+    message: str = ''
+
+
+def load_rules(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    items = data['rules'] if isinstance(data, dict) else data
+    rules = []
+    for i, item in enumerate(items):
+        rule = Rule(item['find'], item['replace'], item.get('scope', 'code'), bool(item.get('word', False)))
+        if not rule.find:
+            raise ValueError(f"Rule {i}: empty 'find'")
+        if rule.scope not in SCOPES:
+            raise ValueError(f"Rule {i}: unknown scope {rule.scope!r} (expected one of {', '.join(SCOPES)})")
+        rules.append(rule)
+    return rules
+
+
+class Matcher:
+    """One combined regex per region kind, holding every rule that applies there.
+
+    A file is matched segment by segment (code between the scanned regions,
+    then each region with its kind's regex), so a rule is never hidden by a
+    longer one whose scope does not fit.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.regexes = {}
+        self.indexes = {}
+        for kind in REGION_KINDS:
+            patterns = {}
+            for index, rule in enumerate(rules):
+                if rule.scope == kind or rule.scope == 'any':
+                    patterns.setdefault((rule.find, rule.word), index)
+            if not patterns:
+                continue
+            # Longest literals first so that overlapping finds prefer the longer one
+            ordered = sorted(patterns.items(), key=lambda item: -len(item[0][0]))
+            alternatives = []
+            for (find, word), _ in ordered:
+                body = re.escape(find)
+                if word:
+                    body = rf'(?<![\w$]){body}(?![\w$])'
+                alternatives.append(f'({body})')
+            self.regexes[kind] = re.compile('|'.join(alternatives))
+            self.indexes[kind] = [index for _, index in ordered]
+
+    def _match(self, text, start, end, kind, found):
+        regex = self.regexes.get(kind)
+        if regex is None or start >= end:
+            return
+        indexes = self.indexes[kind]
+        for m in regex.finditer(text, start, end):
+            found.append((m.start(), m.end(), indexes[m.lastindex - 1]))
+
+    def edits(self, text, regions):
+        """(start, end, rule index) for every match, in source order."""
+        found = []
+        pos = 0
+        for start, end, kind in regions:
+            self._match(text, pos, start, 'code', found)
+            self._match(text, start, end, kind, found)
+            pos = end
+        self._match(text, pos, len(text), 'code', found)
+        return found
+
+
+def apply_rules(text, language, matcher):
+    """(new_text, counts, issue) for one source; issue is set when it cannot be edited."""
+    regions = []
+    if scan_text(text, language, regions=regions):
+        return text, {}, 'unbalanced before edit'
+    counts = {}
+    parts = []
+    last = 0
+    for start, end, index in matcher.edits(text, regions):
+        parts.append(text[last:start])
+        parts.append(matcher.rules[index].replace)
+        counts[index] = counts.get(index, 0) + 1
+        last = end
+    if not counts:
+        return text, counts, None
+    parts.append(text[last:])
+    new_text = ''.join(parts)
+    issues = scan_text(new_text, language)
+    if issues:
+        return text, counts, f'edit would unbalance the file: {issues[0]}'
+    return new_text, counts, None
+
+
+def write_atomic(path, text):
+    tmp_path = f'{path}.codemod.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
+
+
+_matcher = None
+
+
+def _init_worker(rules):
+    global _matcher
+    _matcher = Matcher(rules)
+
+
+def process_file(path, apply=False):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    new_text, counts, problem = apply_rules(text, languages.for_path(path), _matcher)
+    if problem:
+        status = 'skipped' if not counts else 'rejected'
+        return FileEdit(path, status, counts, message=problem)
+    if not counts:
+        return FileEdit(path, 'unchanged')
+    if apply:
+        write_atomic(path, new_text)
+    return FileEdit(path, 'changed', counts, unified_patch(path, text, new_text))
+
+
+def run_codemod(rules, paths, apply=False, jobs=None):
+    """Process `paths` in parallel; yields FileEdit results in input order."""
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(rules,)) as pool:
+        yield from pool.map(process_file, paths, [apply] * len(paths), chunksize=16)
@@ -0,0 +1,156 @@
+"""
+Git history helpers: read file revisions through one persistent
+`git cat-file --batch` process and bisect the commit where a file stopped
+passing the balance check.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass, field
+
+from . import languages
+from .scanner import scan_text
+
+
+def git(*args, cwd=None):
+    out = subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True)
+    return out.stdout.decode('utf-8', errors='replace')
+
+
+def repo_path(path):
+    """(repo root, path relative to it with forward slashes).
+
+    The path may no longer exist: git runs from its nearest existing folder.
+    """
+    path = os.path.abspath(path)
+    folder = os.path.dirname(path)
+    while not os.path.isdir(folder) and os.path.dirname(folder) != folder:
+        folder = os.path.dirname(folder)
+    root = git('rev-parse', '--show-toplevel', cwd=folder).strip()
+    return root, os.path.relpath(path, root).replace(os.sep, '/')
+
+
+class BlobReader:
+    """One long-lived `git cat-file --batch`; blobs are read straight into memory."""
+
+    def __init__(self, root):
+        self.proc = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=root,
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read(self, rev, path):
+        """(blob sha, bytes) for `rev:path`, or (None, None) when it does not exist."""
+        self.proc.stdin.write(f'{rev}:{path}\n'.encode('utf-8'))
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3:
+            return None, None
+        sha, kind, size = header
+        data = self.proc.stdout.read(int(size))
+        self.proc.stdout.read(1)  # trailing LF
+        if kind != b'blob':
+            return None, None
+        return sha.decode('ascii'), data
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class BisectResult:
+    root: str
+    path: str
+    commits: int
+    checks: int = 0
+    first_bad: str = None
+    last_good: str = None
+    issues: list = field(default_factory=list)
+
+
+def _parents(root, commit):
+    return git('rev-list', '--parents', '-n', '1', commit, cwd=root).split()[1:]
+
+
+def bisect_file(path, rev='HEAD', good=None):
+    """Binary-search the commits touching `path` for the first one where it fails the check.
+
+    The search follows first parents, where "balanced, then broken for good"
+    holds like for `git bisect`; the file is assumed balanced when introduced
+    (or at `good`). When the first bad commit is a merge whose first parent is
+    still good, the search continues along the first-parent chain of the
+    merged branch that brought the break, so the result is the commit that
+    broke the file, or the merge itself when every side was balanced.
+    Verdicts are cached per blob hash, so commits that did not change the
+    file content are never rescanned.
+    """
+    language = languages.for_path(path)
+    if language is None:
+        raise ValueError(f"No language registered for {path}")
+    root, rel = repo_path(path)
+    span = [f'{good}..{rev}'] if good else [rev]
+    commits = git('rev-list', '--first-parent', '--reverse', *span, '--', rel, cwd=root).split()
+    result = BisectResult(root, rel, len(commits))
+    if not commits:
+        with BlobReader(root) as reader:
+            if reader.read(rev, rel)[0] is None:
+                raise ValueError(f"{rel} not found in the history of {rev}")
+        return result
+
+    verdicts = {}
+
+    with BlobReader(root) as reader:
+        def issues_at(commit):
+            sha, data = reader.read(commit, rel)
+            if sha is None:
+                return []
+            if sha not in verdicts:
+                result.checks += 1
+                verdicts[sha] = scan_text(data.decode('utf-8', errors='replace'), language)
+            return verdicts[sha]
+
+        hi_issues = issues_at(commits[-1])
+        if not hi_issues:
+            result.last_good = commits[-1]
+            return result
+        last_good = good
+        merged = False
+        while True:
+            lo, hi = -1, len(commits) - 1
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                mid_issues = issues_at(commits[mid])
+                if mid_issues:
+                    hi, hi_issues = mid, mid_issues
+                else:
+                    lo = mid
+            first_bad = commits[hi]
+            parents = _parents(root, first_bad)
+            if lo >= 0:
+                last_good = commits[lo]
+            elif merged and parents:
+                last_good = parents[0]
+            if len(parents) < 2 or issues_at(parents[0]):
+                break
+            side = next((p for p in parents[1:] if issues_at(p)), None)
+            if side is None:
+                break  # every parent balanced: the merge itself broke the file
+            # The break came in with a merged branch: bisect its own first parents
+            side_commits = git('rev-list', '--first-parent', '--reverse', side, f'^{parents[0]}',
+                               '--', rel, cwd=root).split()
+            if not side_commits:
+                break
+            merged = True
+            commits = side_commits
+            result.commits += len(commits)
+            hi_issues = issues_at(side)
+
+    result.first_bad = first_bad
+    result.last_good = last_good
+    result.issues = hi_issues
+    return result
@@ -0,0 +1,128 @@
+"""
+Language registry for the balance scanner.
+
+Each file type declares its comment, string and delimiter rules as data. At
+import time every language is compiled into one code-mode regex plus a
+transition table mapping each named group of that regex to an engine action,
+so one scanner handles every language in the repo.
+"""
+
+import re
+from dataclasses import dataclass
+
+# Engine actions (values of the transition table)
+SKIP = 'skip'
+COMMENT = 'comment'
+OPEN = 'open'
+CLOSE = 'close'
+TEMPLATE = 'template'
+DOLLAR = 'dollar'
+SLASH = 'slash'
+LT = 'lt'
+
+
+@dataclass(frozen=True)
+class Language:
+    name: str
+    extensions: tuple
+    line_comments: tuple = ()
+    block_comments: tuple = ()
+    strings: tuple = ()  # quote chars, backslash escapes, single line
+    doubled_strings: tuple = ()  # quote chars, doubled to escape, may span lines (SQL)
+    delimiters: tuple = ('()', '[]', '{}')
+    template_literals: bool = False
+    regex_literals: bool = False
+    dollar_quotes: bool = False
+    jsx: bool = False
+
+
+@dataclass(frozen=True)
+class CompiledLanguage:
+    spec: Language
+    code: re.Pattern
+    actions: dict
+    pairs: dict
+
+    @property
+    def name(self):
+        return self.spec.name
+
+    @property
+    def jsx(self):
+        return self.spec.jsx
+
+
+def compile_language(spec):
+    parts = []
+    actions = {}
+
+    def add(group, pattern, action):
+        parts.append(f'(?P<{group}>{pattern})')
+        actions[group] = action
+
+    if spec.line_comments:
+        add('line_comment', '|'.join(re.escape(c) + r'[^\n]*' for c in spec.line_comments), COMMENT)
+    if spec.block_comments:
+        add('block_comment', '|'.join(re.escape(a) + r'.*?(?:' + re.escape(b) + r'|\Z)'
+                                      for a, b in spec.block_comments), COMMENT)
+    if spec.dollar_quotes:
+        add('dollar', r'\$(?:[A-Za-z_]\w*)?\$', DOLLAR)
+    for i, q in enumerate(spec.strings):
+        q = re.escape(q)
+        add(f'string{i}', rf'{q}(?:[^{q}\\\n]|\\.)*{q}?', SKIP)
+    for i, q in enumerate(spec.doubled_strings):
+        q = re.escape(q)
+        add(f'doubled{i}', rf'{q}(?:[^{q}]|{q}{q})*{q}?', SKIP)
+    if spec.template_literals:
+        add('template', '`', TEMPLATE)
+    opens = ''.join(pair[0] for pair in spec.delimiters)
+    closes = ''.join(pair[1] for pair in spec.delimiters)
+    add('open', f'[{re.escape(opens)}]', OPEN)
+    add('close', f'[{re.escape(closes)}]', CLOSE)
+    if spec.regex_literals:
+        add('slash', '/', SLASH)
+    if spec.jsx:
+        add('lt', '<', LT)
+
+    pairs = {pair[0]: pair[1] for pair in spec.delimiters}
+    return CompiledLanguage(spec, re.compile('|'.join(parts), re.S), actions, pairs)
+
+
+REGISTRY = {}
+_BY_EXTENSION = {}
+
+
+def register(spec):
+    compiled = compile_language(spec)
+    REGISTRY[spec.name] = compiled
+    for ext in spec.extensions:
+        _BY_EXTENSION[ext] = compiled
+    return compiled
+
+
+def get_language(name):
+    return REGISTRY[name]
+
+
+def for_path(path):
+    """Compiled language for a file name, or None when the type is not registered."""
+    path = str(path).lower()
+    dot = path.rfind('.')
+    return _BY_EXTENSION.get(path[dot:]) if dot != -1 else None
+
+
+def extensions():
+    return tuple(_BY_EXTENSION)
+
+
+_JS = dict(line_comments=('//',), block_comments=(('/*', '*/'),), strings=('"', "'"),
+           template_literals=True, regex_literals=True)
+
+register(Language('javascript', ('.cjs', '.mjs'), **_JS))
+register(Language('jsx', ('.js', '.jsx'), jsx=True, **_JS))
+register(Language('typescript', ('.ts', '.mts', '.cts'), **_JS))
+register(Language('tsx', ('.tsx',), jsx=True, **_JS))
+register(Language('json', ('.json',), strings=('"',), delimiters=('[]', '{}')))
+register(Language('css', ('.css',), block_comments=(('/*', '*/'),), strings=('"', "'")))
+register(Language('sql', ('.sql',), line_comments=('--',), block_comments=(('/*', '*/'),),
+                  doubled_strings=("'", '"'), dollar_quotes=True, delimiters=('()', '[]')))
@@ -0,0 +1,127 @@
+"""
+Structural complexity metrics collected from the balance scan.
+
+One scan per file records the matched blocks (see scan_text's `blocks`); the
+metrics are derived from them: nesting depth, the largest top-level blocks
+with their line spans, top-level components/functions and the JSX depth
+distribution. `report` aggregates them repo-wide, largest blocks first.
+"""
+
+import bisect
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+
+from .languages import get_language
+from .scanner import ELEMENT, TAG, line_at, line_starts, line_text, nest, scan_text
+
+_DECLARATION = re.compile(r'''
+    ^[ \t]*(?:export[ \t]+(?:default[ \t]+)?)?
+    (?:
+        (?:async[ \t]+)?function\*?[ \t]*(?P<function>[\w$]+)
+      | class[ \t]+(?P<class>[\w$]+)(?P<extends>[ \t]+extends[ \t]+(?:React\.)?(?:Pure)?Component\b)?
+      | (?:const|let|var)[ \t]+(?P<arrow>[\w$]+)[ \t]*(?::[^=\n]+)?=[ \t]*
+        (?:(?:React\.)?(?:memo|forwardRef)[ \t]*\([ \t]*)?(?:async[ \t]*)?
+        (?:function\b|\([^)\n]*$|\([^)\n]*\)[ \t]*(?::[^=\n]+)?=>|[\w$]+[ \t]*=>)
+    )
+''', re.M | re.X)
+
+LABEL_WIDTH = 80
+CHILDREN_PER_BLOCK = 3
+
+
+@dataclass
+class Block:
+    start_line: int
+    end_line: int
+    lines: int
+    label: str
+    children: list = field(default_factory=list)
+
+
+@dataclass
+class FileMetrics:
+    path: str
+    language: str
+    lines: int
+    balanced: bool
+    max_depth: int = 0
+    max_depth_line: int = 0
+    components: int = 0
+    functions: int = 0
+    top_blocks: list = field(default_factory=list)
+    jsx_depths: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def measure(text, language, path=''):
+    """Scan `text` once and return (issues, FileMetrics)."""
+    if isinstance(language, str):
+        language = get_language(language)
+    blocks = []
+    issues = scan_text(text, language, blocks)
+    starts = line_starts(text)
+
+    def label_of(pos):
+        return line_text(text, starts, line_at(starts, pos))[:LABEL_WIDTH]
+
+    metrics = FileMetrics(path, language.name, len(starts), not issues)
+
+    blocks.sort(key=lambda b: (b[2], -b[4]))
+    depths, parents = nest([(b[2], b[4]) for b in blocks])
+    if depths:
+        deepest = max(range(len(depths)), key=depths.__getitem__)
+        metrics.max_depth = depths[deepest]
+        metrics.max_depth_line = line_at(starts, blocks[deepest][2])
+
+    # Top-level blocks and their largest children. Blocks opening on the first
+    # line of a top-level block (memo((...) => {, params) are wrappers: their
+    # own children count as children of the top-level block.
+    top = {}
+    head = {}  # block index -> top-level index, for the top block and its wrappers
+    for i, block in enumerate(blocks):
+        start, end = line_at(starts, block[2]), line_at(starts, block[3])
+        if depths[i] == 1:
+            top[i] = Block(start, end, end - start + 1, label_of(block[2]))
+            head[i] = i
+            continue
+        owner = head.get(parents[i])
+        if owner is None:
+            continue
+        if start == top[owner].start_line:
+            head[i] = owner
+        else:
+            top[owner].children.append(Block(start, end, end - start + 1, label_of(block[2])))
+    for entry in top.values():
+        entry.children.sort(key=lambda b: -b.lines)
+        del entry.children[CHILDREN_PER_BLOCK:]
+    metrics.top_blocks = sorted(top.values(), key=lambda b: -b.lines)
+
+    # Declarations that start at depth 0
+    top_spans = [(b[2], b[4]) for b, d in zip(blocks, depths) if d == 1]
+    top_opens = [span[0] for span in top_spans]
+    for m in _DECLARATION.finditer(text):
+        i = bisect.bisect_left(top_opens, m.start()) - 1
+        if i >= 0 and top_spans[i][1] > m.start():
+            continue
+        name = m.group('function') or m.group('arrow')
+        if m.group('class'):
+            if m.group('extends'):
+                metrics.components += 1
+        elif language.jsx and name[:1].isupper():
+            metrics.components += 1
+        else:
+            metrics.functions += 1
+
+    elements = [(b[2], b[4]) for b in blocks if b[0] == ELEMENT or b[0] == TAG]
+    metrics.jsx_depths = dict(sorted(Counter(nest(elements)[0]).items()))
+    return issues, metrics
+
+
+def largest_blocks(all_metrics, top=20):
+    """(FileMetrics, Block) pairs across files, largest first."""
+    pairs = [(m, b) for m in all_metrics for b in m.top_blocks]
+    pairs.sort(key=lambda pair: -pair[1].lines)
+    return pairs[:top]
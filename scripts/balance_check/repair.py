@@ -0,0 +1,197 @@
+"""
+Budgeted minimal-repair search for unbalanced files.
+
+Candidates come from the scanner's first issue and its structural index (the
+blocks it matched): first the closers missing from blocks whose closing line
+is indented differently from their opening line, then the expected closer
+before one of the lines that end the open block by indentation, inline before
+the offending token, or the deletion of a stray token. States are
+explored best-first (fewest edits, then best-ranked candidates), each one
+verified with a rescan, until the file is balanced or the node/time budget
+runs out. The result is a unified diff that `git apply` accepts.
+"""
+
+import difflib
+import heapq
+import os
+import subprocess
+import time
+from dataclasses import dataclass, field
+
+from .history import repo_path
+from .languages import get_language
+from .scanner import DELIM, ELEMENT, scan_text
+
+MAX_EDITS = 3
+CANDIDATES_PER_ISSUE = 4
+
+
+@dataclass
+class Repair:
+    text: str = None  # repaired text, None when nothing was found within budget
+    edits: list = field(default_factory=list)
+    nodes: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def found(self):
+        return self.text is not None
+
+
+def _line_start(text, pos):
+    return text.rfind('\n', 0, pos) + 1
+
+
+def _line_end(text, pos):
+    end = text.find('\n', pos)
+    return len(text) if end == -1 else end
+
+
+def _leading(line):
+    return line[:len(line) - len(line.lstrip(' \t'))]
+
+
+def _delete(text, pos, length):
+    """Delete a token, or its whole line when it stands alone on it."""
+    start, end = _line_start(text, pos), _line_end(text, pos)
+    if text[start:end].strip() == text[pos:pos + length]:
+        return (start, min(end + 1, len(text)) - start, '')
+    return (pos, length, '')
+
+
+def _block_end_lines(text, open_pos, limit, count):
+    """Line starts after `open_pos` (before `limit`) that dedent to the opener's level."""
+    open_start = _line_start(text, open_pos)
+    lead = _leading(text[open_start:_line_end(text, open_start)])
+    found = []
+    nl = text.find('\n', open_pos)
+    while nl != -1 and nl < limit and len(found) < count:
+        start = nl + 1
+        end = _line_end(text, start)
+        line = text[start:end]
+        if line.strip() and len(_leading(line)) <= len(lead):
+            found.append(start)
+        nl = end if end < len(text) else -1
+    return lead, found
+
+
+def _newline(text):
+    """The file's dominant line ending, used for inserted lines."""
+    crlf = text.count('\r\n')
+    return '\r\n' if crlf and crlf * 2 >= text.count('\n') else '\n'
+
+
+def _misindented(text, blocks, pairs, newline):
+    """Closer insertions for matched blocks whose closing line dedents past the opener."""
+    edits = []
+    for kind, value, open_pos, close_start, _ in reversed(blocks):
+        if kind != DELIM and kind != ELEMENT:
+            continue
+        line_start = _line_start(text, close_start)
+        if text[line_start:close_start].strip():
+            continue
+        open_start = _line_start(text, open_pos)
+        if close_start - line_start >= len(_leading(text[open_start:_line_end(text, open_start)])):
+            continue
+        closer = pairs.get(value, '}') if kind == DELIM else f'</{value}>'
+        lead, lines = _block_end_lines(text, open_pos, line_start, 1)
+        if lines:
+            edits.append((lines[0], 0, f'{lead}{closer}{newline}'))
+            if len(edits) == 2:
+                break
+    return edits
+
+
+def _candidates(text, issue, blocks, pairs, newline):
+    """Edits (pos, delete_len, insert) worth trying for `issue`, best first."""
+    if issue.kind == 'unexpected':
+        return _misindented(text, blocks, pairs, newline) + [_delete(text, issue.pos, len(issue.token))]
+
+    closer = issue.expected
+    limit = issue.pos if issue.kind == 'mismatch' else len(text)
+    lead, lines = _block_end_lines(text, issue.open_pos, limit, CANDIDATES_PER_ISSUE)
+    edits = _misindented(text, blocks, pairs, newline)
+    edits += [(start, 0, f'{lead}{closer}{newline}') for start in lines]
+
+    if issue.kind == 'mismatch':
+        edits.append((issue.pos, 0, closer))
+        edits.append(_delete(text, issue.pos, len(issue.token)))
+    elif not edits:
+        tail = '' if text.endswith('\n') else newline
+        edits.append((len(text), 0, f'{tail}{lead}{closer}{newline}'))
+    if len(issue.opener) == 1:
+        edits.append(_delete(text, issue.open_pos, 1))
+    return edits
+
+
+def _target(issues):
+    """First hard error, else the innermost unclosed frame."""
+    for issue in issues:
+        if issue.kind != 'unclosed':
+            return issue
+    return issues[-1]
+
+
+def _apply(text, edits):
+    for pos, length, insert in edits:
+        text = text[:pos] + insert + text[pos + length:]
+    return text
+
+
+def suggest_repair(text, language, max_nodes=200, budget_ms=500):
+    """Search for the smallest edit set that makes `text` balanced."""
+    if isinstance(language, str):
+        language = get_language(language)
+    started = time.perf_counter()
+    deadline = started + budget_ms / 1000
+    repair = Repair()
+    newline = _newline(text)
+    heap = [(0, 0, 0, ())]
+    seen = set()
+    counter = 0
+
+    while heap and repair.nodes < max_nodes and time.perf_counter() < deadline:
+        n_edits, rank, _, edits = heapq.heappop(heap)
+        candidate = _apply(text, edits)
+        key = hash(candidate)
+        if key in seen:
+            continue
+        seen.add(key)
+        repair.nodes += 1
+        blocks = []
+        issues = scan_text(candidate, language, blocks)
+        if not issues:
+            if edits:
+                repair.text, repair.edits = candidate, list(edits)
+            break
+        if n_edits == MAX_EDITS:
+            continue
+        for i, edit in enumerate(_candidates(candidate, _target(issues), blocks, language.pairs, newline)):
+            counter += 1
+            heapq.heappush(heap, (n_edits + 1, rank + i, counter, edits + (edit,)))
+
+    repair.elapsed_ms = (time.perf_counter() - started) * 1000
+    return repair
+
+
+def _patch_name(path):
+    """Path relative to the file's repository root (to the current directory outside a repo)."""
+    try:
+        return repo_path(path)[1]
+    except (subprocess.CalledProcessError, OSError):
+        return os.path.relpath(path).replace(os.sep, '/')
+
+
+def unified_patch(path, old_text, new_text):
+    """Unified diff of one file, `git apply` / `patch -p1` compatible from the repo root."""
+    name = _patch_name(path)
+    lines = difflib.unified_diff(
+        old_text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+        fromfile=f'a/{name}', tofile=f'b/{name}')
+    return ''.join(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n'
+                   for line in lines)
+
+
+def repair_patch(path, text, repair):
+    """Unified diff for a found repair."""
+    return unified_patch(path, text, repair.text)
@@ -0,0 +1,372 @@
+"""
+Single-pass delimiter and JSX tag balance scanner.
+
+The scanner walks the source once with a small mode stack: code (driven by the
+language's compiled regex and transition table, see languages.py), template
+literals, JSX open tags (attributes) and JSX children. Strings, comments and
+regex literals are skipped so that their content never counts as structure.
+Like the old check_syntax*.py scripts, the scan stops at the first hard error
+(unexpected closer or mismatch) and reports every frame left open at EOF.
+
+Generic arrows written the .tsx way (`<T,>(x: T) => x`, `<T extends U>(...)`)
+are skipped as type parameters; the bare `<T>(x) => x` form is read as JSX,
+as TypeScript itself does in .tsx files.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass, field
+
+from . import languages
+from .languages import CLOSE, COMMENT, LT, OPEN, SKIP, SLASH
+from .languages import DOLLAR as DOLLAR_QUOTE, TEMPLATE as TEMPLATE_START
+
+# Frame kinds on the scanner stack: (kind, value, pos)
+DELIM = 'delim'
+DOLLAR = 'dollar'
+TEMPLATE = 'template'
+TAG = 'tag'
+ELEMENT = 'element'
+
+_NEWLINE = re.compile('\n')
+_TEMPLATE_BODY = re.compile(r'(?P<template_end>`)|(?P<template_expr>\$\{)|\\.', re.S)
+
+_TAG_BODY = re.compile(r'''
+    (?P<string>"[^"]*"|'[^']*')
+  | (?P<open>\{)
+  | (?P<self_close>/\s*>)
+  | (?P<tag_end>>)
+  | (?P<comment>/\*.*?(?:\*/|\Z)|//[^\n]*)
+  | (?P<close>[)\]}])
+''', re.S | re.X)
+
+_CHILDREN = re.compile(r'(?P<open>\{)|(?P<lt><)|(?P<close>\})')
+
+_TAG_NAME = re.compile(r'<\s*([A-Za-z_$][\w$.:-]*)')
+_FRAGMENT = re.compile(r'<\s*>')
+_CLOSING_TAG = re.compile(r'</\s*([\w$.:-]*)\s*>')
+# `<T,>(x) =>` / `<T extends U>(x) =>`: a generic arrow's type parameters, never a JSX tag
+_TYPE_PARAMS = re.compile(r'<\s*[A-Za-z_$][\w$]*\s*(?:,|extends\b)')
+_ANGLES = re.compile(r'=>|[<>]')
+_REGEX_LITERAL = re.compile(r'/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+# A `<` or `/` after one of these starts an expression (JSX / regex literal)
+_EXPR_START_CHARS = frozenset('(,=:[!&|?{};>+-*%~^')
+_EXPR_KEYWORDS = frozenset((
+    'return', 'yield', 'await', 'default', 'case', 'typeof', 'void', 'delete',
+    'new', 'throw', 'in', 'of', 'instanceof', 'do', 'else',
+))
+
+
+@dataclass
+class Issue:
+    kind: str  # 'unexpected' | 'mismatch' | 'unclosed'
+    token: str
+    pos: int
+    line: int
+    col: int
+    opener: str = None
+    open_pos: int = None
+    open_line: int = None
+    expected: str = None
+
+    def __str__(self):
+        if self.kind == 'unexpected':
+            return f"Unexpected {self.token} at line {self.line}, col {self.col}"
+        if self.kind == 'mismatch':
+            return (f"Mismatch: Expected {self.expected} for {self.opener} at line {self.open_line}, "
+                    f"but found {self.token} at line {self.line}")
+        return f"Unclosed {self.opener} at line {self.open_line}"
+
+
+@dataclass
+class ScanResult:
+    path: str
+    issues: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.issues
+
+
+def line_col(text, pos):
+    """1-based (line, col) of an offset."""
+    line = text.count('\n', 0, pos) + 1
+    return line, pos - text.rfind('\n', 0, pos)
+
+
+def line_starts(text):
+    """Offset where each line of `text` starts, for repeated line_at / line_text lookups."""
+    return [0] + [m.end() for m in _NEWLINE.finditer(text)]
+
+
+def line_at(starts, pos):
+    """1-based line of an offset, given line_starts(text)."""
+    return bisect.bisect_right(starts, pos)
+
+
+def line_text(text, starts, line):
+    """Stripped text of a 1-based line, given line_starts(text)."""
+    end = starts[line] - 1 if line < len(starts) else len(text)
+    return text[starts[line - 1]:end].strip()
+
+
+def _describe(frame):
+    kind, value, _ = frame
+    if kind in (DELIM, DOLLAR):
+        return value
+    if kind == TEMPLATE:
+        return '`'
+    if kind == TAG:
+        return f'<{value}'
+    return f'<{value}>'
+
+
+def _closer(frame, pairs):
+    kind, value, _ = frame
+    if kind == DELIM:
+        return pairs.get(value, '}')
+    if kind == DOLLAR:
+        return value
+    if kind == TEMPLATE:
+        return '`'
+    if kind == TAG:
+        return '>'
+    return f'</{value}>'
+
+
+def _expects_expression(text, pos, comment_span):
+    """True when the code before `pos` leaves the parser expecting an expression."""
+    j = pos - 1
+    while True:
+        while j >= 0 and text[j] in ' \t\r\n':
+            j -= 1
+        if comment_span[0] <= j < comment_span[1]:
+            j = comment_span[0] - 1
+            continue
+        break
+    if j < 0:
+        return True
+    ch = text[j]
+    if ch in '+-' and j > 0 and text[j - 1] == ch:
+        return False  # postfix ++/--: an operator follows, not an operand
+    if ch in _EXPR_START_CHARS:
+        return True
+    if ch.isalnum() or ch in '_$':
+        k = j
+        while k >= 0 and (text[k].isalnum() or text[k] in '_$'):
+            k -= 1
+        return text[k + 1:j + 1] in _EXPR_KEYWORDS
+    return False
+
+
+def _skip_type_params(text, pos):
+    """End of the type parameter list opening at `pos`, or None when it is not closed."""
+    depth = 0
+    for m in _ANGLES.finditer(text, pos):
+        if m.group() == '<':
+            depth += 1
+        elif m.group() == '>':
+            depth -= 1
+            if depth == 0:
+                return m.end()
+    return None
+
+
+def _issue(text, kind, token, pos, frame=None, pairs=None):
+    line, col = line_col(text, pos)
+    issue = Issue(kind, token, pos, line, col)
+    if frame is not None:
+        issue.opener = _describe(frame)
+        issue.expected = _closer(frame, pairs or {})
+        issue.open_pos = frame[2]
+        issue.open_line = line_col(text, frame[2])[0]
+    return issue
+
+
+def scan_text(text, language='jsx', blocks=None, regions=None):
+    """Scan `text` and return the list of balance issues (empty when balanced).
+
+    `language` is a registered language name or a CompiledLanguage. When a
+    `blocks` list is given, every closed delimiter, dollar-quoted body and JSX
+    element is appended to it as (kind, value, open_pos, close_start, close_end),
+    in closing order. When a `regions` list is given, the non-code spans are
+    appended to it in source order as (start, end, kind), kind being 'string'
+    (quotes included, template literal chunks), 'comment', 'regex' or 'text'
+    (JSX children text).
+    """
+    if isinstance(language, str):
+        language = languages.get_language(language)
+    code, actions, pairs = language.code, language.actions, language.pairs
+    stack = []
+    issues = []
+    pos = 0
+    comment_span = (0, 0)
+
+    def fail(kind, token, start, frame=None):
+        issues.append(_issue(text, kind, token, start, frame, pairs))
+        return issues
+
+    while True:
+        kind = stack[-1][0] if stack else DELIM
+
+        if kind == DELIM or kind == DOLLAR:
+            m = code.search(text, pos)
+            if m is None:
+                break
+            start, pos = m.start(), m.end()
+            action = actions[m.lastgroup]
+            if regions is not None and (action == SKIP or action == COMMENT):
+                regions.append((start, pos, 'string' if action == SKIP else 'comment'))
+            if action == OPEN:
+                stack.append((DELIM, m.group(), start))
+            elif action == CLOSE:
+                ch = m.group()
+                if not stack:
+                    return fail('unexpected', ch, start)
+                if kind != DELIM or pairs.get(stack[-1][1]) != ch:
+                    return fail('mismatch', ch, start, stack[-1])
+                frame = stack.pop()
+                if blocks is not None:
+                    blocks.append(frame + (start, pos))
+            elif action == COMMENT:
+                if comment_span[1] and not text[comment_span[1]:start].strip():
+                    comment_span = (comment_span[0], pos)
+                else:
+                    comment_span = (start, pos)
+            elif action == TEMPLATE_START:
+                stack.append((TEMPLATE, '`', start))
+            elif action == DOLLAR_QUOTE:
+                tag = m.group()
+                if kind == DOLLAR and stack[-1][1] == tag:
+                    frame = stack.pop()
+                    if blocks is not None:
+                        blocks.append(frame + (start, pos))
+                elif any(frame[0] == DOLLAR and frame[1] == tag for frame in stack):
+                    return fail('mismatch', tag, start, stack[-1])
+                else:
+                    stack.append((DOLLAR, tag, start))
+            elif action == SLASH:
+                if _expects_expression(text, start, comment_span):
+                    literal = _REGEX_LITERAL.match(text, start)
+                    if literal:
+                        pos = literal.end()
+                        if regions is not None:
+                            regions.append((start, pos, 'regex'))
+            elif action == LT:
+                closing = _CLOSING_TAG.match(text, start)
+                if closing:
+                    return fail('unexpected', closing.group(), start)
+                if not _expects_expression(text, start, comment_span):
+                    continue
+                fragment = _FRAGMENT.match(text, start)
+                if fragment:
+                    stack.append((ELEMENT, '', start))
+                    pos = fragment.end()
+                    continue
+                if _TYPE_PARAMS.match(text, start):
+                    end = _skip_type_params(text, start)
+                    if end is not None:
+                        pos = end
+                        continue
+                tag = _TAG_NAME.match(text, start)
+                if tag:
+                    stack.append((TAG, tag.group(1), start))
+                    pos = tag.end()
+
+        elif kind == TEMPLATE:
+            m = _TEMPLATE_BODY.search(text, pos)
+            while m is not None and m.lastgroup is None:  # escape sequence
+                m = _TEMPLATE_BODY.search(text, m.end())
+            if m is None:
+                break
+            if regions is not None and m.start() > pos:
+                regions.append((pos, m.start(), 'string'))
+            pos = m.end()
+            if m.lastgroup == 'template_end':
+                stack.pop()
+            elif m.lastgroup == 'template_expr':
+                stack.append((DELIM, '{', m.start() + 1))
+
+        elif kind == TAG:
+            m = _TAG_BODY.search(text, pos)
+            if m is None:
+                break
+            group, start, pos = m.lastgroup, m.start(), m.end()
+            if regions is not None and (group == 'string' or group == 'comment'):
+                regions.append((start, pos, group))
+            if group == 'open':
+                stack.append((DELIM, '{', start))
+            elif group == 'self_close':
+                frame = stack.pop()
+                if blocks is not None:
+                    blocks.append(frame + (start, pos))
+            elif group == 'tag_end':
+                _, name, tag_pos = stack.pop()
+                stack.append((ELEMENT, name, tag_pos))
+            elif group == 'close':
+                return fail('mismatch', m.group(), start, stack[-1])
+
+        else:  # ELEMENT: JSX children, text is opaque
+            m = _CHILDREN.search(text, pos)
+            if m is None:
+                break
+            if regions is not None and text[pos:m.start()].strip():
+                regions.append((pos, m.start(), 'text'))
+            group, start, pos = m.lastgroup, m.start(), m.end()
+            if group == 'open':
+                stack.append((DELIM, '{', start))
+            elif group == 'close':
+                return fail('mismatch', '}', start, stack[-1])
+            else:
+                closing = _CLOSING_TAG.match(text, start)
+                if closing:
+                    pos = closing.end()
+                    if closing.group(1) != stack[-1][1]:
+                        return fail('mismatch', closing.group(), start, stack[-1])
+                    frame = stack.pop()
+                    if blocks is not None:
+                        blocks.append(frame + (start, pos))
+                    continue
+                fragment = _FRAGMENT.match(text, start)
+                if fragment:
+                    stack.append((ELEMENT, '', start))
+                    pos = fragment.end()
+                    continue
+                tag = _TAG_NAME.match(text, start)
+                if tag:
+                    stack.append((TAG, tag.group(1), start))
+                    pos = tag.end()
+
+    for frame in stack:
+        issues.append(_issue(text, 'unclosed', _describe(frame), frame[2], frame, pairs))
+    return issues
+
+
+def nest(spans):
+    """(depths, parents) of (open_pos, close_end) spans sorted by open_pos; depth 1 is outermost.
+
+    Turns the `blocks` recorded by scan_text into a tree: parents[i] is the
+    index of the innermost span enclosing span i, or -1 at top level.
+    """
+    open_indexes = []
+    depths = []
+    parents = []
+    for i, (open_pos, close_end) in enumerate(spans):
+        while open_indexes and spans[open_indexes[-1]][1] <= open_pos:
+            open_indexes.pop()
+        parents.append(open_indexes[-1] if open_indexes else -1)
+        open_indexes.append(i)
+        depths.append(len(open_indexes))
+    return depths, parents
+
+
+def scan_file(path, language=None):
+    """Scan a file with the language registered for its extension (or `language`)."""
+    if language is None:
+        language = languages.for_path(path)
+        if language is None:
+            raise ValueError(f"No language registered for {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return ScanResult(str(path), scan_text(text, language))
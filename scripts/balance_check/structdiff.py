@@ -0,0 +1,261 @@
+"""
+Structural diff of two versions of a file.
+
+Each version becomes a tree of the blocks the balance scan matches
+(delimiters, JSX elements, dollar-quoted bodies) under a root for the whole
+file. Nodes are hashed bottom-up from their own lines and their children's
+hashes, indentation and blank lines ignored, so an identical subtree is
+recognised by one hash comparison wherever it ended up.
+
+The trees are walked top-down from the roots. Identical subtrees match at
+once; inside a changed pair, the children and the lines outside them are
+aligned, leftover children are paired by hash (moved), by opening line, then
+inside each replaced run by similarity and by position among blocks with the
+same opener (changed, compared recursively). Whatever is still unpaired is
+removed or added, except the subtrees found again by hash on the other side
+(moved). A subtree on the same lines under the same parent is never reported
+as moved.
+"""
+
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+
+from .languages import get_language
+from .scanner import line_at, line_starts, line_text, nest, scan_text
+
+MIN_MOVE_CHARS = 40  # smaller subtrees ({}, (x)) recur everywhere, matching them proves nothing
+MIN_SIMILARITY = 0.5
+MAX_SIMILARITY_CHECKS = 400  # per replaced run, past that leftover blocks are paired by position only
+
+
+@dataclass(eq=False)
+class Node:
+    start: int
+    end: int
+    start_line: int
+    end_line: int
+    label: str
+    opener: str = ''  # delimiter, tag name or dollar tag; '' for the root
+    parent: 'Node' = field(default=None, repr=False)
+    children: list = field(default_factory=list)
+    tokens: list = field(default_factory=list)  # own lines, stripped, and child hashes, in order
+    refs: list = field(default_factory=list)    # line number or child Node for each token
+    digest: str = ''
+    chars: int = 0    # non-blank characters in the subtree
+    blocks: int = 1   # nodes in the subtree
+
+    @property
+    def lines(self):
+        return self.end_line - self.start_line + 1
+
+
+@dataclass
+class Change:
+    kind: str  # 'removed' | 'added' | 'moved' | 'changed'
+    old: Node = None
+    new: Node = None
+    removed_lines: list = field(default_factory=list)  # (line, text) outside child blocks
+    added_lines: list = field(default_factory=list)
+
+
+@dataclass
+class StructDiff:
+    changes: list = field(default_factory=list)
+    unchanged: int = 0  # blocks matched identically in place
+
+    @property
+    def identical(self):
+        return not self.changes
+
+    def count(self, kind):
+        return sum(1 for change in self.changes if change.kind == kind)
+
+
+def _seal(node, text, starts):
+    """Tokenize the node's own text around its children and hash it."""
+    pos = node.start
+    for child in node.children + [None]:
+        end = child.start if child else node.end
+        line = line_at(starts, pos)
+        for offset, fragment in enumerate(text[pos:end].split('\n')):
+            fragment = fragment.strip()
+            if fragment:
+                node.tokens.append(fragment)
+                node.refs.append(line + offset)
+                node.chars += len(fragment)
+        if child:
+            node.tokens.append('#' + child.digest)
+            node.refs.append(child)
+            node.chars += child.chars
+            node.blocks += child.blocks
+            pos = child.end
+    node.digest = hashlib.sha1('\n'.join(node.tokens).encode('utf-8')).hexdigest()
+
+
+def build_tree(text, language):
+    """(root Node, issues) for `text`; the tree is partial when issues is not empty."""
+    if isinstance(language, str):
+        language = get_language(language)
+    blocks = []
+    issues = scan_text(text, language, blocks)
+    starts = line_starts(text)
+    blocks.sort(key=lambda b: (b[2], -b[4]))
+    root = Node(0, len(text), 1, len(starts), '')
+    nodes = []
+    for _, value, open_pos, _, close_end in blocks:
+        line = line_at(starts, open_pos)
+        nodes.append(Node(open_pos, close_end, line, line_at(starts, close_end - 1),
+                          line_text(text, starts, line), value))
+    _, parents = nest([(node.start, node.end) for node in nodes])
+    for node, parent in zip(nodes, parents):
+        node.parent = nodes[parent] if parent >= 0 else root
+        node.parent.children.append(node)
+    for node in reversed(nodes):  # children open after their parent
+        _seal(node, text, starts)
+    _seal(root, text, starts)
+    return root, issues
+
+
+def _pair(olds, news, key):
+    """Pair nodes with equal keys in order; returns (pairs, unpaired olds, unpaired news)."""
+    index = defaultdict(list)
+    for node in reversed(news):
+        index[key(node)].append(node)
+    pairs, left = [], []
+    for node in olds:
+        candidates = index.get(key(node))
+        if candidates:
+            pairs.append((node, candidates.pop()))
+        else:
+            left.append(node)
+    paired = {id(new) for _, new in pairs}
+    return pairs, left, [node for node in news if id(node) not in paired]
+
+
+def _pair_similar(olds, news):
+    """Pair nodes with the same opener and similar tokens, most similar first."""
+    if len(olds) * len(news) > MAX_SIMILARITY_CHECKS:
+        return [], olds, news
+    scored = []
+    for i, a in enumerate(olds):
+        for j, b in enumerate(news):
+            if a.opener == b.opener:
+                ratio = SequenceMatcher(None, a.tokens, b.tokens, autojunk=False).quick_ratio()
+                if ratio >= MIN_SIMILARITY:
+                    scored.append((-ratio, i, j))
+    pairs, used_old, used_new = [], set(), set()
+    for _, i, j in sorted(scored):
+        if i not in used_old and j not in used_new:
+            used_old.add(i)
+            used_new.add(j)
+            pairs.append((olds[i], news[j]))
+    return (pairs, [a for i, a in enumerate(olds) if i not in used_old],
+            [b for j, b in enumerate(news) if j not in used_new])
+
+
+def _in_place(old, new, paired):
+    """True when `new` sits on the same lines as `old` under the same parent."""
+    while old.parent and new.parent and (old.start_line, old.end_line) == (new.start_line, new.end_line):
+        if paired.get(id(old.parent)) is new.parent:
+            return True
+        old, new = old.parent, new.parent
+    return False
+
+
+def _walk(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
+
+
+def diff_trees(old, new):
+    """StructDiff between two trees from build_tree."""
+    result = StructDiff()
+    removed, added = [], []
+    paired = {id(old): new}  # old node -> new node it was compared with
+    pending = [(old, new)]
+    while pending:
+        o, n = pending.pop()
+        if o.digest == n.digest:
+            result.unchanged += o.blocks
+            continue
+        change = Change('changed', o, n)
+        old_rest, new_rest = [], []
+        run = {}  # leftover child -> index of its opcode
+        matcher = SequenceMatcher(None, o.tokens, n.tokens, autojunk=False)
+        for index, (tag, i1, i2, j1, j2) in enumerate(matcher.get_opcodes()):
+            if tag == 'equal':
+                result.unchanged += sum(ref.blocks for ref in o.refs[i1:i2] if isinstance(ref, Node))
+                continue
+            for i in range(i1, i2):
+                if isinstance(o.refs[i], Node):
+                    old_rest.append(o.refs[i])
+                    run[id(o.refs[i])] = index
+                else:
+                    change.removed_lines.append((o.refs[i], o.tokens[i]))
+            for j in range(j1, j2):
+                if isinstance(n.refs[j], Node):
+                    new_rest.append(n.refs[j])
+                    run[id(n.refs[j])] = index
+                else:
+                    change.added_lines.append((n.refs[j], n.tokens[j]))
+        if change.removed_lines or change.added_lines:
+            result.changes.append(change)
+
+        reordered, old_rest, new_rest = _pair(old_rest, new_rest, lambda node: node.digest)
+        for a, b in reordered:
+            if _in_place(a, b, paired):
+                result.unchanged += a.blocks
+            else:
+                result.changes.append(Change('moved', a, b))
+        edited, old_rest, new_rest = _pair(old_rest, new_rest, lambda node: node.label)
+
+        # Blocks replaced in the same place: an edited opening line, not a removal
+        runs = defaultdict(lambda: ([], []))
+        for side, rest in enumerate((old_rest, new_rest)):
+            for node in rest:
+                runs[run[id(node)]][side].append(node)
+        old_rest, new_rest = [], []
+        for olds, news in runs.values():
+            similar, olds, news = _pair_similar(olds, news)
+            by_position, olds, news = _pair(olds, news, lambda node: node.opener)
+            edited += similar + by_position
+            old_rest += olds
+            new_rest += news
+
+        paired.update((id(a), b) for a, b in edited)
+        pending.extend(reversed(edited))
+        removed.extend(old_rest)
+        added.extend(new_rest)
+
+    # Subtrees that left one place and reappeared elsewhere
+    targets = defaultdict(list)
+    for root in reversed(added):
+        for node in _walk(root):
+            if node.chars >= MIN_MOVE_CHARS:
+                targets[node.digest].append(node)
+    moved_to = set()
+    for root in removed:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            candidates = targets.get(node.digest)
+            if node.chars >= MIN_MOVE_CHARS and candidates:
+                target = candidates.pop()
+                moved_to.add(id(target))
+                if _in_place(node, target, paired):
+                    result.unchanged += node.blocks
+                else:
+                    result.changes.append(Change('moved', node, target))
+            else:
+                if node is root:
+                    result.changes.append(Change('removed', node))
+                stack.extend(reversed(node.children))
+    result.changes.extend(Change('added', new=node) for node in added if id(node) not in moved_to)
+
+    result.changes.sort(key=lambda c: (c.old or c.new).start)
+    return result
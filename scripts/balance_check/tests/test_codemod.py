@@ -0,0 +1,57 @@
+import pytest
+
+from scripts.balance_check.codemod import Matcher, Rule, apply_rules
+
+CASES = [
+    ('code only by default',
+     [Rule('foo', 'bar')],
+     'foo("foo"); // foo\n',
+     'bar("foo"); // foo\n'),
+    ('word boundaries',
+     [Rule('id', 'key', word=True)],
+     'const id = item.id + idx + $id;',
+     'const key = item.key + idx + $id;'),
+    ('string and comment scopes',
+     [Rule("'lbs'", "'lb'", scope='string'), Rule('TODO', 'FIXME', scope='comment')],
+     "unit = 'lbs'; /* TODO */ TODO();",
+     "unit = 'lb'; /* FIXME */ TODO();"),
+    ('JSX text scope',
+     [Rule('Masse', 'Mass', scope='text')],
+     'const a = <p title="Masse">Masse {Masse}</p>;',
+     'const a = <p title="Masse">Mass {Masse}</p>;'),
+    ('overlapping finds fall back to the rule that fits the scope',
+     [Rule('foo.bar', 'X', scope='comment'), Rule('foo', 'baz', word=True)],
+     'f(foo.bar + foo); // foo.bar\n',
+     'f(baz.bar + baz); // X\n'),
+    ('longest find wins in the same scope',
+     [Rule('foo', 'a'), Rule('foo.bar', 'b')],
+     'foo.bar(foo);',
+     'b(a);'),
+    ('same find, different scopes',
+     [Rule('kg', 'KG', scope='string'), Rule('kg', 'mass')],
+     'kg = "kg";',
+     'mass = "KG";'),
+    ('any scope, inside template expressions too',
+     [Rule('x', 'y', scope='any')],
+     'f(`x ${x}`, /x/);',
+     'f(`y ${y}`, /y/);'),
+]
+
+
+@pytest.mark.parametrize('rules, source, expected',
+                         [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_apply_rules(rules, source, expected):
+    new_text, counts, problem = apply_rules(source, 'jsx', Matcher(rules))
+    assert problem is None
+    assert new_text == expected
+
+
+def test_rejects_unbalancing_edit():
+    text = 'f({});'
+    new_text, counts, problem = apply_rules(text, 'jsx', Matcher([Rule('{}', '{')]))
+    assert new_text == text and counts == {0: 1}
+    assert problem.startswith('edit would unbalance the file')
+
+
+def test_skips_unbalanced_file():
+    assert apply_rules('f(', 'jsx', Matcher([Rule('f', 'g')])) == ('f(', {}, 'unbalanced before edit')
@@ -0,0 +1,61 @@
+import shutil
+import subprocess
+
+import pytest
+
+from scripts.balance_check.history import bisect_file
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+TOP = 'function top() {\n  return 1;\n}\n'
+BOTTOM = 'function bottom() {\n  return 2;\n}\n'
+
+
+def _git(repo, *args):
+    return subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t', *args], cwd=repo,
+                          check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _commit(repo, text, message):
+    (repo / 'src' / 'a.js').write_text(text)
+    _git(repo, 'add', '-A')
+    _git(repo, 'commit', '-q', '-m', message)
+    return _git(repo, 'rev-parse', 'HEAD')
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / 'src').mkdir()
+    _git(tmp_path, 'init', '-q', '-b', 'main')
+    return tmp_path
+
+
+def test_break_on_a_merged_branch(repo):
+    _commit(repo, TOP + BOTTOM, 'initial')
+    _git(repo, 'checkout', '-q', '-b', 'side')
+    good = _commit(repo, TOP + BOTTOM.replace('2', '3'), 'side: balanced edit')
+    bad = _commit(repo, TOP + BOTTOM.replace('2', '(3'), 'side: break')
+    _git(repo, 'checkout', '-q', 'main')
+    _commit(repo, TOP.replace('1', '0') + BOTTOM, 'main: balanced edit')
+    _git(repo, 'merge', '-q', '--no-edit', 'side')
+
+    result = bisect_file(str(repo / 'src' / 'a.js'))
+    assert (result.first_bad, result.last_good) == (bad, good)
+    assert [str(issue) for issue in result.issues] == [
+        'Mismatch: Expected ) for ( at line 5, but found } at line 6']
+
+
+def test_folder_deleted_since(repo):
+    _commit(repo, TOP, 'initial')
+    bad = _commit(repo, TOP + '(', 'break')
+    _git(repo, 'rm', '-q', '-r', 'src')
+    _git(repo, 'commit', '-q', '-m', 'remove src')
+
+    result = bisect_file(str(repo / 'src' / 'a.js'), rev='HEAD~1')
+    assert result.first_bad == bad
+
+
+def test_path_not_in_history(repo):
+    _commit(repo, TOP, 'initial')
+    with pytest.raises(ValueError, match='src/b.js not found in the history of HEAD'):
+        bisect_file(str(repo / 'src' / 'b.js'))
@@ -0,0 +1,58 @@
+import pytest
+
+from scripts.balance_check import scan_text
+
+CASES = [
+    # JSX
+    ('ternary JSX', 'jsx', 'const a = ok ? <A x={1} /> : <B>{y}</B>;', []),
+    ('arrow JSX', 'jsx', 'const C = () => <div className="c">{items.map(i => <I key={i} />)}</div>;', []),
+    ('fragment', 'jsx', 'return (<>\n  <A />\n  text {x}\n</>);', []),
+    ('JSX text is opaque', 'jsx', "const a = <p>it's (not) {'code'} </p>;", []),
+    ('comparison is not JSX', 'jsx', 'if (a < b && c > d) { f(); }', []),
+    ('comparison after postfix increment', 'jsx', 'while (i++ < n) {}\nfor (; j-- < n;) { f(j); }', []),
+    ('stray closing fragment', 'jsx', 'const a = 1;\n</>', ['Unexpected </> at line 2, col 1']),
+    ('crossed tags', 'jsx', 'const a = <div><span></div></span>;',
+     ['Mismatch: Expected </span> for <span> at line 1, but found </div> at line 1']),
+    ('unclosed element', 'jsx', 'const a = <div>\n  <p>x</p>\n',
+     ['Unclosed <div> at line 1']),
+    # Regex literals and division
+    ('regex with brackets', 'javascript', 'const r = /[)}\\]]+/g; f(r);', []),
+    ('division', 'javascript', 'const x = (a / b) / (c / d);', []),
+    ('regex after return', 'javascript', 'function f(s) { return /\\(/.test(s); }', []),
+    # Template literals
+    ('nested templates', 'javascript', 'const s = `a ${f(`b ${g({ c: `}` })}`)} )`;', []),
+    ('unclosed template expression', 'javascript', 'const s = `a ${f(1);\n',
+     ['Unclosed ` at line 1', 'Unclosed { at line 1']),  # outermost first
+    # Strings and comments
+    ('delimiters in strings and comments', 'javascript', 'f("(", \'[\'); // )\n/* } */', []),
+    ('mismatch', 'javascript', 'f([1, 2)];',
+     ['Mismatch: Expected ] for [ at line 1, but found ) at line 1']),
+    ('unexpected closer', 'javascript', 'f();\n}', ['Unexpected } at line 2, col 1']),
+    # TypeScript
+    ('generic arrow with comma', 'tsx', 'const f = <T,>(x: T) => x;', []),
+    ('generic arrow with extends', 'tsx', 'const f = <T extends Array<U>>(x: T) => <A v={x} />;', []),
+    ('type arguments', 'typescript', 'const m = new Map<string, Array<number>>();', []),
+    # SQL
+    ('dollar-quoted body', 'sql',
+     "create function f() returns int as $body$ select ')' ; $body$ language sql;", []),
+    ('nested dollar tags', 'sql', 'do $a$ begin perform $b$ f(x) $b$; end $a$;', []),
+    ('dollar body is checked', 'sql', 'do $a$ begin perform $b$ ( $b$; end $a$;',
+     ['Mismatch: Expected ) for ( at line 1, but found $b$ at line 1']),
+    ('unclosed dollar quote', 'sql', 'do $fn$ begin (', ['Unclosed $fn$ at line 1', 'Unclosed ( at line 1']),
+    ('doubled quotes', 'sql', "select 'it''s (' from t where x in (1, 2);", []),
+]
+
+
+@pytest.mark.parametrize('language, source, expected',
+                         [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_scan_text(language, source, expected):
+    assert [str(issue) for issue in scan_text(source, language)] == expected
+
+
+def test_blocks_and_regions():
+    blocks, regions = [], []
+    source = 'f("a", /b/); <p>t</p>'
+    assert scan_text(source, 'jsx', blocks, regions) == []
+    assert [(kind, value) for kind, value, *_ in blocks] == [('delim', '('), ('element', 'p')]
+    assert [(source[start:end], kind) for start, end, kind in regions] == [
+        ('"a"', 'string'), ('/b/', 'regex'), ('t', 'text')]
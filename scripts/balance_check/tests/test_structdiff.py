@@ -0,0 +1,43 @@
+from scripts.balance_check.structdiff import build_tree, diff_trees
+
+OLD = '''function compute(a, b) {
+  const total = a + b;
+  if (total > 10) {
+    log('big total value here');
+    return total * 2;
+  }
+  return total;
+}
+'''
+
+
+def _diff(old, new):
+    return diff_trees(build_tree(old, 'javascript')[0], build_tree(new, 'javascript')[0])
+
+
+def test_identical():
+    result = _diff(OLD, OLD)
+    assert result.identical and result.unchanged == 6  # the root, then 5 blocks
+
+
+def test_edited_opening_line_is_a_change():
+    new = OLD.replace('(a, b)', '(a, b, c)').replace('a + b;', 'a + b + c;')
+    result = _diff(OLD, new)
+    assert [change.kind for change in result.changes] == ['changed', 'changed']
+    assert result.changes[0].added_lines == [(1, '(a, b, c)')]
+    assert result.changes[1].added_lines == [(2, 'const total = a + b + c;')]
+    assert result.unchanged == 3
+
+
+def test_moved_block():
+    other = 'function other() {\n  return compute(1, 2) + compute(3, 4);\n}\n'
+    result = _diff(OLD + other, other + OLD)
+    assert [(change.kind, change.old.start_line, change.new.start_line)
+            for change in result.changes if change.kind != 'changed'] == [('moved', 9, 1), ('moved', 9, 1)]
+
+
+def test_removed_block():
+    block = OLD[OLD.index('  if'):OLD.index('  return total;')]
+    result = _diff(OLD, OLD.replace(block, ''))
+    assert [change.kind for change in result.changes] == ['changed', 'removed', 'removed']
+    assert {change.old.label for change in result.changes[1:]} == {'if (total > 10) {'}
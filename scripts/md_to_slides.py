@@ -0,0 +1,313 @@
+"""
+Conversion des rapports Markdown (AUDIT_*.md, guides...) en slides ALFlight
+
+- Chaque document est lu en flux, ligne par ligne :
+  # titre     -> slide de transition (sous-titre = premier paragraphe)
+  ## section  -> slide(s) titre + contenu
+  ### / puces / paragraphes / tableaux -> lignes de contenu, niveaux 0 à 2
+  (constructeurs de alflight_slides.py : "  " = niveau 1, "    " = niveau 2)
+- Les sections trop longues sont paginées ("Titre (2/3)")
+- Les documents sont convertis en parallèle (pool de processus), un deck par
+  document ou un deck fusionné (--merged)
+- Un cache par hash de contenu évite de reconvertir les documents inchangés
+
+Usage :
+    python scripts/md_to_slides.py "AUDIT_*.md" --out-dir slides
+    python scripts/md_to_slides.py "AUDIT_*.md" SECTION_PERFORMANCE_ENRICHIE.md --merged Audits.pptx
+    python scripts/md_to_slides.py "*.md" --out-dir slides --template ALFlight_Presentation.pptx
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from alflight_slides import CRITICAL, add_title_content_slide, add_transition_slide  # installe python-pptx si nécessaire
+from pptx import Presentation
+
+# À incrémenter quand le découpage change : invalide le cache
+PLAN_VERSION = 1
+CACHE_DIR = '.md_slides_cache'
+MANIFEST = '.md_slides_manifest.json'
+MAX_LINE_CHARS = 160
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_BULLET = re.compile(r'^(\s*)(?:[-*+]|\d+[.)])\s+(.*)$')
+_TABLE_SEPARATOR = re.compile(r'^\s*\|?\s*:?-{2,}:?\s*(?:\|\s*:?-{2,}:?\s*)*\|?\s*$')
+_RULE = re.compile(r'^\s*(?:-{3,}|\*{3,}|_{3,})\s*$')
+_INLINE = [
+    (re.compile(r'!\[([^\]]*)\]\([^)]*\)'), r'\1'),
+    (re.compile(r'\[([^\]]+)\]\([^)]*\)'), r'\1'),
+    (re.compile(r'(\*\*|__)(.+?)\1'), r'\2'),
+    (re.compile(r'(?<![\w*])\*(?!\s)([^*]+?)\*(?![\w*])'), r'\1'),
+    (re.compile(r'`([^`]*)`'), r'\1'),
+    (re.compile(r'<[^>]+>'), ''),
+]
+
+
+def clean_inline(text):
+    """Retire la syntaxe Markdown inline (gras, liens, code, HTML)"""
+    for pattern, repl in _INLINE:
+        text = pattern.sub(repl, text)
+    text = text.strip()
+    if len(text) > MAX_LINE_CHARS:
+        text = text[:MAX_LINE_CHARS - 1].rstrip() + '…'
+    return text
+
+
+def _indented(level, text):
+    return '  ' * level + text
+
+
+def iter_blocks(lines):
+    """Flux Markdown -> événements ('h', niveau, texte) / ('line', niveau, texte)"""
+    in_code = False
+    sub_heading = False
+    for raw in lines:
+        line = raw.rstrip('\n')
+        if line.lstrip().startswith(('```', '~~~')):
+            in_code = not in_code
+            continue
+        if in_code or not line.strip() or _RULE.match(line) or _TABLE_SEPARATOR.match(line):
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            depth = len(heading.group(1))
+            if depth <= 2:
+                sub_heading = False
+                yield ('h', depth, clean_inline(heading.group(2)))
+            else:
+                sub_heading = True
+                yield ('line', 0, clean_inline(heading.group(2)))
+            continue
+        base = 1 if sub_heading else 0
+        bullet = _BULLET.match(line)
+        if bullet:
+            nesting = len(bullet.group(1).expandtabs(4)) // 2
+            yield ('line', min(base + nesting, 2), '• ' + clean_inline(bullet.group(2)))
+        elif line.lstrip().startswith('|'):
+            cells = [clean_inline(c) for c in line.strip().strip('|').split('|')]
+            yield ('line', min(base + 1, 2), ' — '.join(c for c in cells if c))
+        elif line.lstrip().startswith('>'):
+            yield ('line', base, clean_inline(line.lstrip()[1:]))
+        else:
+            yield ('line', base, clean_inline(line))
+
+
+def paginate(title, lines, max_lines):
+    """Découpe une section en pages, de préférence avant une ligne de niveau 0"""
+    pages = []
+    current = []
+    for i, line in enumerate(lines):
+        top_level = not line.startswith(' ')
+        if current and (len(current) >= max_lines or
+                        (top_level and len(current) >= max_lines * 2 // 3 and
+                         len(current) + _group_size(lines, i) > max_lines)):
+            pages.append(current)
+            current = []
+        current.append(line)
+    if current:
+        pages.append(current)
+    if len(pages) == 1:
+        return [(title, pages[0])]
+    return [(f"{title} ({n}/{len(pages)})", page) for n, page in enumerate(pages, 1)]
+
+
+def _group_size(lines, start):
+    size = 1
+    for line in lines[start + 1:]:
+        if not line.startswith(' '):
+            break
+        size += 1
+    return size
+
+
+def plan_document(path, max_lines):
+    """Plan de slides (données pures, sérialisables) d'un document Markdown"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    plan = []
+    section_title = None
+    section_lines = []
+    pending_subtitle = False
+
+    def flush():
+        if section_title is not None and section_lines:
+            for title, page in paginate(section_title, section_lines, max_lines):
+                plan.append({'kind': 'content', 'title': title, 'lines': page})
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for kind, level, text in iter_blocks(f):
+            if kind == 'h' and level == 1:
+                flush()
+                plan.append({'kind': 'transition', 'title': text, 'subtitle': None})
+                section_title, section_lines = text, []
+                pending_subtitle = True
+            elif kind == 'h':
+                flush()
+                section_title, section_lines = text, []
+                pending_subtitle = False
+            elif text:
+                if pending_subtitle and plan[-1]['subtitle'] is None and level == 0:
+                    plan[-1]['subtitle'] = text
+                    pending_subtitle = False
+                    continue
+                pending_subtitle = False
+                if section_title is None:
+                    section_title = stem
+                section_lines.append(_indented(level, text))
+    flush()
+
+    if not plan or plan[0]['kind'] != 'transition':
+        plan.insert(0, {'kind': 'transition', 'title': stem, 'subtitle': None})
+    return plan
+
+
+def new_presentation(template=None):
+    """Deck vide, avec les masters/layouts du template s'il est fourni"""
+    if template is None:
+        return Presentation()
+    from pptx_zip import DeckAppender
+    return DeckAppender(template).presentation
+
+
+def build_deck(plans, out_path, template=None):
+    prs = new_presentation(template)
+    for plan in plans:
+        for slide in plan:
+            # Titres plus petits que la présentation : ils viennent de titres Markdown parfois longs
+            if slide['kind'] == 'transition':
+                add_transition_slide(prs, slide['title'], slide['subtitle'],
+                                     title_size=44, subtitle_size=24, word_wrap=True)
+            else:
+                add_title_content_slide(prs, slide['title'], slide['lines'],
+                                        title_size=32, highlights=CRITICAL)
+    prs.save(out_path)
+    return len(prs.slides)
+
+
+def file_digest(path, prefix=''):
+    h = hashlib.sha256(prefix.encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def plan_digest(path, max_lines):
+    """Clé du cache de plans : contenu du document et paramètres du découpage"""
+    return file_digest(path, f'{PLAN_VERSION}:{max_lines}:')
+
+
+def template_digest(template):
+    """Chemin et contenu du template : les decks sont à refaire si l'un ou l'autre change"""
+    if template is None:
+        return ''
+    return f'{os.path.abspath(template)}:{file_digest(template)}'
+
+
+def deck_digest(plan_key, template_key):
+    """Clé du manifeste : le plan, plus le template s'il y en a un"""
+    if not template_key:
+        return plan_key
+    return hashlib.sha256(f'{plan_key}:{template_key}'.encode()).hexdigest()
+
+
+def cached_plan(cache_dir, digest):
+    path = os.path.join(cache_dir, f'{digest}.json')
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return None
+
+
+def store_plan(cache_dir, digest, plan):
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, f'{digest}.json'), 'w', encoding='utf-8') as f:
+        json.dump(plan, f, ensure_ascii=False)
+
+
+def convert_one(path, max_lines, out_path=None, template=None, plan=None):
+    """Tâche du pool : plan du document (sauf s'il vient du cache), et deck individuel si out_path est donné"""
+    if plan is None:
+        plan = plan_document(path, max_lines)
+    count = build_deck([plan], out_path, template) if out_path else None
+    return plan, count
+
+
+def expand(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(p for p in matches if p not in paths)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('documents', nargs='+', help='fichiers .md ou motifs glob')
+    parser.add_argument('--out-dir', default='slides', help='dossier des decks individuels')
+    parser.add_argument('--merged', help='un seul deck fusionné (chemin .pptx)')
+    parser.add_argument('--template', help='deck dont on reprend masters et layouts')
+    parser.add_argument('--max-lines', type=int, default=12, help='lignes max par slide')
+    parser.add_argument('--jobs', type=int, default=None, help='processus (défaut : nb de CPU)')
+    parser.add_argument('--no-cache', action='store_true', help='reconvertit tout')
+    args = parser.parse_args(argv)
+
+    documents = expand(args.documents)
+    digests = {path: plan_digest(path, args.max_lines) for path in documents}
+    plans = {}
+    if not args.no_cache:
+        for path, digest in digests.items():
+            plan = cached_plan(CACHE_DIR, digest)
+            if plan is not None:
+                plans[path] = plan
+
+    manifest_path = os.path.join(args.out_dir, MANIFEST)
+    manifest = {}
+    if args.merged:
+        todo = {path: None for path in documents if path not in plans}
+    else:
+        os.makedirs(args.out_dir, exist_ok=True)
+        if os.path.exists(manifest_path) and not args.no_cache:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        todo = {}
+        deck_keys = {}
+        template_key = template_digest(args.template)
+        for path in documents:
+            out_path = os.path.join(args.out_dir, os.path.splitext(os.path.basename(path))[0] + '.pptx')
+            deck_keys[path] = deck_digest(digests[path], template_key)
+            if manifest.get(out_path) == deck_keys[path] and os.path.exists(out_path):
+                print(f"  = {path} inchangé")
+                continue
+            todo[path] = out_path
+
+    print(f"{len(documents)} document(s), {len(todo)} à convertir")
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {path: pool.submit(convert_one, path, args.max_lines, out_path, args.template,
+                                     plans.get(path))
+                   for path, out_path in todo.items()}
+        for path, future in futures.items():
+            plan, count = future.result()
+            if path not in plans:
+                plans[path] = plan
+                store_plan(CACHE_DIR, digests[path], plan)
+            if todo[path]:
+                manifest[todo[path]] = deck_keys[path]
+                print(f"  ✅ {path} -> {todo[path]} ({count} slides)")
+
+    if args.merged:
+        count = build_deck([plans[path] for path in documents], args.merged, args.template)
+        print(f"✅ Deck fusionné : {args.merged} ({count} slides)")
+    else:
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
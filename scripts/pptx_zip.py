@@ -0,0 +1,352 @@
+"""
+Accès rapide aux decks .pptx au niveau du zip
+
+- inspect_deck : liste les slides (ID, partie, titre) en lisant uniquement
+  ppt/presentation.xml, ses rels et le XML des slides (jamais les médias)
+- DeckAppender : ajoute des slides sans recharger ni réécrire tout le deck.
+  Les nouvelles slides sont construites avec python-pptx dans un squelette
+  (masters, layouts, thème) ; à l'enregistrement, chaque membre inchangé du
+  zip d'origine est recopié tel quel (octets compressés), seules les nouvelles
+  parties et les index (presentation.xml, rels, [Content_Types].xml) sont écrits.
+  Un master de notes créé pour les nouvelles slides est déclaré dans presentation.xml.
+
+Usage : python scripts/pptx_zip.py ALFlight_Presentation.pptx
+"""
+
+import copy
+import html
+import io
+import os
+import posixpath
+import re
+import struct
+import sys
+import zipfile
+from dataclasses import dataclass
+
+PRESENTATION = 'ppt/presentation.xml'
+PRESENTATION_RELS = 'ppt/_rels/presentation.xml.rels'
+CONTENT_TYPES = '[Content_Types].xml'
+APP_PROPS = 'docProps/app.xml'
+REL_TYPES = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+SLIDE_REL_TYPE = REL_TYPES + 'slide'
+SKIPPED_REL_TYPES = (SLIDE_REL_TYPE, REL_TYPES + 'notesSlide')
+# Masters que python-pptx peut créer pour les nouvelles slides (notes) : liste de presentation.xml
+MASTER_LISTS = {REL_TYPES + 'notesMaster': 'notesMaster', REL_TYPES + 'handoutMaster': 'handoutMaster'}
+ID_LISTS = ('sldMasterIdLst', 'notesMasterIdLst', 'handoutMasterIdLst')  # ordre du schéma
+
+_SLD_ID = re.compile(r'<p:sldId\b[^>]*>')
+_SLD_ID_LIST = re.compile(r'<p:sldIdLst>.*?</p:sldIdLst>|<p:sldIdLst/>', re.S)
+_ATTR = re.compile(r'([\w:]+)="([^"]*)"')
+_RELATIONSHIP = re.compile(r'<Relationship\b[^>]*>')
+_DEFAULT = re.compile(r'<Default\b[^>]*>')
+_OVERRIDE = re.compile(r'<Override\b[^>]*>')
+_SHAPE = re.compile(r'<p:sp\b.*?</p:sp>', re.S)
+_TITLE_PH = re.compile(r'<p:ph\b[^>]*type="(?:title|ctrTitle)"')
+_TEXT = re.compile(r'<a:t(?:\s[^>]*)?>([^<]*)</a:t>')
+_PART_NUMBER = re.compile(r'^(.*?)(\d*)(\.\w+)$')
+
+
+@dataclass
+class SlideInfo:
+    index: int
+    slide_id: int
+    rel_id: str
+    part: str
+    title: str = None
+
+
+def _read(zf, name):
+    return zf.read(name).decode('utf-8')
+
+
+def _attrs(tag):
+    return dict(_ATTR.findall(tag))
+
+
+def _relationships(xml):
+    return [_attrs(tag) for tag in _RELATIONSHIP.findall(xml)]
+
+
+def _rels_name(part):
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, '_rels', name + '.rels')
+
+
+def _resolve(base, target):
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(base, target))
+
+
+def _slide_list(zf):
+    xml = _read(zf, PRESENTATION)
+    rels = {rel['Id']: rel for rel in _relationships(_read(zf, PRESENTATION_RELS))}
+    slides = []
+    for i, tag in enumerate(_SLD_ID.findall(xml), 1):
+        attrs = _attrs(tag)
+        rel_id = attrs['r:id']
+        slides.append(SlideInfo(i, int(attrs['id']), rel_id, _resolve('ppt', rels[rel_id]['Target'])))
+    return slides
+
+
+def _shape_text(shape):
+    return html.unescape(' '.join(t for t in _TEXT.findall(shape) if t.strip())).strip()
+
+
+def slide_title(zf, part):
+    """Texte du placeholder titre, sinon premier texte de la slide"""
+    shapes = _SHAPE.findall(_read(zf, part))
+    for shape in shapes:
+        if _TITLE_PH.search(shape) and _shape_text(shape):
+            return _shape_text(shape)
+    for shape in shapes:
+        text = _shape_text(shape)
+        if text:
+            return text
+    return ''
+
+
+def inspect_deck(path, titles=True):
+    """Liste des slides d'un deck sans charger les médias ni python-pptx"""
+    with zipfile.ZipFile(path) as zf:
+        slides = _slide_list(zf)
+        if titles:
+            for slide in slides:
+                slide.title = slide_title(zf, slide.part)
+    return slides
+
+
+def _reachable(zf, names, skip_types=()):
+    """Parties atteignables depuis la racine du package en suivant les rels"""
+    seen = set()
+    todo = ['']
+    while todo:
+        part = todo.pop()
+        rels = '_rels/.rels' if part == '' else _rels_name(part)
+        if rels not in names:
+            continue
+        base = posixpath.dirname(part)
+        for rel in _relationships(_read(zf, rels)):
+            if rel.get('TargetMode') == 'External' or rel['Type'] in skip_types:
+                continue
+            target = _resolve(base, rel['Target'])
+            if target in names and target not in seen:
+                seen.add(target)
+                todo.append(target)
+    return seen
+
+
+def _skeleton(zf):
+    """Copie minimale du deck : tout ce qui est atteignable sans passer par les slides"""
+    names = set(zf.namelist())
+    parts = _reachable(zf, names, SKIPPED_REL_TYPES)
+    kept = {CONTENT_TYPES, '_rels/.rels'}
+    kept |= parts | {_rels_name(p) for p in parts if _rels_name(p) in names}
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_STORED) as out:
+        for name in sorted(kept):
+            data = zf.read(name)
+            if name == PRESENTATION:
+                data = _SLD_ID_LIST.sub('<p:sldIdLst/>', data.decode('utf-8')).encode('utf-8')
+            elif name == PRESENTATION_RELS:
+                xml = _RELATIONSHIP.sub(
+                    lambda m: '' if _attrs(m.group())['Type'] in SKIPPED_REL_TYPES else m.group(),
+                    data.decode('utf-8'))
+                data = xml.encode('utf-8')
+            out.writestr(name, data)
+    return buf.getvalue(), kept
+
+
+def _free_name(name, taken):
+    prefix, _, ext = _PART_NUMBER.match(name).groups()
+    n = 1
+    while f'{prefix}{n}{ext}' in taken:
+        n += 1
+    return f'{prefix}{n}{ext}'
+
+
+def _insert_before(xml, marker, text):
+    i = xml.rindex(marker)
+    return xml[:i] + text + xml[i:]
+
+
+def _copy_raw(src, info, out):
+    """Recopie un membre sans le décompresser (en-tête local + données + descripteur)"""
+    src.fp.seek(info.header_offset)
+    header = src.fp.read(zipfile.sizeFileHeader)
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    size = name_len + extra_len + info.compress_size
+    if info.flag_bits & 0x08:
+        src.fp.seek(info.header_offset + zipfile.sizeFileHeader + size)
+        size += 16 if src.fp.read(4) == b'PK\x07\x08' else 12
+        src.fp.seek(info.header_offset + zipfile.sizeFileHeader)
+    entry = copy.copy(info)
+    entry.header_offset = out.fp.tell()
+    out.fp.write(header)
+    while size:
+        chunk = src.fp.read(min(size, 1 << 20))
+        out.fp.write(chunk)
+        size -= len(chunk)
+    # zipfile n'a pas d'API d'écriture brute : on enregistre l'entrée pour le répertoire central
+    out.filelist.append(entry)
+    out.NameToInfo[entry.filename] = entry
+    out.start_dir = out.fp.tell()
+    out._didModify = True
+
+
+class DeckAppender:
+    """Ajout de slides en fin de deck, coût proportionnel aux slides ajoutées"""
+
+    def __init__(self, path):
+        from pptx import Presentation
+
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            self._names = set(zf.namelist())
+            self.base_slides = _slide_list(zf)
+            skeleton, self._skeleton_names = _skeleton(zf)
+        self.presentation = Presentation(io.BytesIO(skeleton))
+
+    @property
+    def slide_count(self):
+        return len(self.base_slides) + len(self.presentation.slides)
+
+    def save(self, out_path):
+        buf = io.BytesIO()
+        self.presentation.save(buf)
+        with zipfile.ZipFile(buf) as built, zipfile.ZipFile(self.path) as src:
+            replaced, added = self._merge(built, src)
+            tmp_path = out_path + '.tmp'
+            with open(tmp_path, 'wb') as fp, zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED) as out:
+                for info in src.infolist():
+                    if info.filename in replaced:
+                        entry = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                        entry.compress_type = zipfile.ZIP_DEFLATED
+                        out.writestr(entry, replaced[info.filename])
+                    else:
+                        _copy_raw(src, info, out)
+                for name, data in added.items():
+                    out.writestr(name, data)
+        os.replace(tmp_path, out_path)
+
+    def _merge(self, built, src):
+        """(membres réécrits, nouveaux membres) à partir du squelette enregistré"""
+        built_names = set(built.namelist())
+        new_slides = _slide_list(built)
+
+        # Nouvelles parties : slides + tout ce qu'elles référencent et qui n'existait pas
+        new_parts = []
+        todo = [slide.part for slide in new_slides]
+        while todo:
+            part = todo.pop(0)
+            if part in new_parts or part in self._skeleton_names:
+                continue
+            new_parts.append(part)
+            rels = _rels_name(part)
+            if rels in built_names:
+                for rel in _relationships(_read(built, rels)):
+                    if rel.get('TargetMode') != 'External':
+                        todo.append(_resolve(posixpath.dirname(part), rel['Target']))
+
+        taken = set(self._names)
+        renamed = {}
+        for part in new_parts:
+            renamed[part] = _free_name(part, taken) if part in taken else part
+            taken.add(renamed[part])
+
+        added = {}
+        for part in new_parts:
+            name = renamed[part]
+            added[name] = built.read(part)
+            rels = _rels_name(part)
+            if rels in built_names:
+                old_dir, new_dir = posixpath.dirname(part), posixpath.dirname(name)
+
+                def retarget(m):
+                    attrs = _attrs(m.group())
+                    if attrs.get('TargetMode') == 'External':
+                        return m.group()
+                    target = renamed.get(_resolve(old_dir, attrs['Target']))
+                    if target is None:
+                        target = _resolve(old_dir, attrs['Target'])
+                    rel_target = posixpath.relpath(target, new_dir)
+                    return m.group().replace(f'Target="{attrs["Target"]}"', f'Target="{rel_target}"')
+
+                added[_rels_name(name)] = _RELATIONSHIP.sub(retarget, _read(built, rels)).encode('utf-8')
+
+        # [Content_Types].xml : overrides des nouvelles parties, defaults manquants
+        types = _read(src, CONTENT_TYPES)
+        built_types = _read(built, CONTENT_TYPES)
+        overrides = {_attrs(t)['PartName']: _attrs(t)['ContentType'] for t in _OVERRIDE.findall(built_types)}
+        defaults = {_attrs(t)['Extension'].lower() for t in _DEFAULT.findall(types)}
+        entries = []
+        for part in new_parts:
+            ext = part.rsplit('.', 1)[-1].lower()
+            if f'/{part}' in overrides:
+                entries.append(f'<Override PartName="/{renamed[part]}" ContentType="{overrides[f"/{part}"]}"/>')
+            elif ext not in defaults:
+                for tag in _DEFAULT.findall(built_types):
+                    if _attrs(tag)['Extension'].lower() == ext:
+                        entries.append(tag if tag.endswith('/>') else tag[:-1] + '/>')
+                        defaults.add(ext)
+        replaced = {CONTENT_TYPES: _insert_before(types, '</Types>', ''.join(entries)).encode('utf-8')}
+
+        # presentation.xml + rels : masters créés pour les nouvelles slides, puis entrées sldIdLst
+        xml = _read(src, PRESENTATION)
+        rels_xml = _read(src, PRESENTATION_RELS)
+        next_id = max([slide.slide_id for slide in self.base_slides] + [255]) + 1
+        rel_numbers = [int(r['Id'][3:]) for r in _relationships(rels_xml) if r['Id'][3:].isdigit()]
+        next_rel = max(rel_numbers + [0]) + 1
+        sld_ids, section_ids, relationships = [], [], []
+        for rel in _relationships(_read(built, PRESENTATION_RELS)):
+            part = _resolve('ppt', rel['Target'])
+            if rel['Type'] == SLIDE_REL_TYPE or part not in renamed:
+                continue
+            kind = MASTER_LISTS.get(rel['Type'])
+            if kind is None:
+                raise ValueError(f"{part} : partie de présentation créée par les nouvelles slides, "
+                                 f"type {rel['Type']} non pris en charge")
+            rel_id = f'rId{next_rel}'
+            target = posixpath.relpath(renamed[part], 'ppt')
+            relationships.append(f'<Relationship Id="{rel_id}" Type="{rel["Type"]}" Target="{target}"/>')
+            next_rel += 1
+            if f'<p:{kind}IdLst>' in xml:
+                raise ValueError(f"{part} : le deck a déjà un {kind}")
+            preceding = ID_LISTS[:ID_LISTS.index(f'{kind}IdLst')]
+            anchor = max(xml.rfind(f'</p:{tag}>') + len(f'</p:{tag}>') for tag in preceding)
+            xml = xml[:anchor] + f'<p:{kind}IdLst><p:{kind}Id r:id="{rel_id}"/></p:{kind}IdLst>' + xml[anchor:]
+        for slide in new_slides:
+            rel_id = f'rId{next_rel}'
+            sld_ids.append(f'<p:sldId id="{next_id}" r:id="{rel_id}"/>')
+            section_ids.append(f'<p14:sldId id="{next_id}"/>')
+            target = posixpath.relpath(renamed[slide.part], 'ppt')
+            relationships.append(f'<Relationship Id="{rel_id}" Type="{SLIDE_REL_TYPE}" Target="{target}"/>')
+            next_id += 1
+            next_rel += 1
+        if '</p:sldIdLst>' in xml:
+            xml = _insert_before(xml, '</p:sldIdLst>', ''.join(sld_ids))
+        elif '<p:sldIdLst/>' in xml:
+            xml = xml.replace('<p:sldIdLst/>', f'<p:sldIdLst>{"".join(sld_ids)}</p:sldIdLst>')
+        else:
+            anchor = max(xml.rfind(f'</p:{tag}>') + len(f'</p:{tag}>')
+                         for tag in ('sldMasterIdLst', 'notesMasterIdLst', 'handoutMasterIdLst'))
+            xml = xml[:anchor] + f'<p:sldIdLst>{"".join(sld_ids)}</p:sldIdLst>' + xml[anchor:]
+        if '</p14:sldIdLst>' in xml:
+            xml = _insert_before(xml, '</p14:sldIdLst>', ''.join(section_ids))
+        replaced[PRESENTATION] = xml.encode('utf-8')
+        replaced[PRESENTATION_RELS] = _insert_before(
+            rels_xml, '</Relationships>', ''.join(relationships)).encode('utf-8')
+
+        if APP_PROPS in self._names:
+            app = re.sub(r'<Slides>\d+</Slides>', f'<Slides>{self.slide_count}</Slides>', _read(src, APP_PROPS))
+            replaced[APP_PROPS] = app.encode('utf-8')
+        return replaced, added
+
+
+if __name__ == '__main__':
+    deck_path = sys.argv[1] if len(sys.argv) > 1 else 'ALFlight_Presentation.pptx'
+    deck_slides = inspect_deck(deck_path)
+    print(f"{deck_path} : {len(deck_slides)} slides")
+    for s in deck_slides:
+        print(f"  {s.index:>3}  id={s.slide_id:<5} {s.part:<28} {s.title}")